@@ -1,17 +1,62 @@
-from src.main import async_main
-from src.search import search_txt_files
-from fastapi import FastAPI, HTTPException
+from main import async_main
+from search import iter_txt_entries, scan_and_preview
+from core.model_provider import get_model_provider
+from langfuse import get_client
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from dotenv import load_dotenv
+from pydantic import BaseModel, Field
+from core.env import load_env
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+import anyio
+import asyncio
+import heapq
+import multiprocessing
+import orjson
 import os
-from typing import List, Dict
+from pathlib import Path
+from typing import List, Dict, Literal, Optional, Tuple
 
-load_dotenv()
+load_env()
 
-app = FastAPI(title="AI Contract Generator", description="Generate professional contracts with AI assistance")
+# Contracts are only served from inside this folder, whatever folder a request names
+_CONTRACTS_ROOT = Path(os.getenv("CONTRACTS_ROOT", "contracts")).resolve()
+
+async def prewarm_model_provider():
+    """Create the shared model provider up front so the first contract request doesn't pay for it"""
+    try:
+        await anyio.to_thread.run_sync(get_model_provider)
+    except Exception as e:
+        # Searching and listing contracts still work without OpenAI credentials
+        print(f"Model provider prewarm skipped: {e}")
+
+async def prewarm_langfuse():
+    """Initialize the Langfuse client up front so the first request doesn't pay for its setup"""
+    await anyio.to_thread.run_sync(get_client)
+
+async def flush_langfuse():
+    """Flush buffered Langfuse spans once on shutdown instead of after every request"""
+    await anyio.to_thread.run_sync(get_client().flush)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the shared clients and own the search worker pool for one run of the app"""
+    await prewarm_model_provider()
+    await prewarm_langfuse()
+    # Worker processes that scan and preview search candidates in parallel, outside the GIL.
+    # "spawn" avoids forking a parent that already runs the event loop's and Langfuse's threads.
+    # Created here rather than at import, so every startup (reloads, reused test clients) gets a live pool.
+    search_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+    app.state.search_pool = search_pool
+    try:
+        yield
+    finally:
+        await anyio.to_thread.run_sync(search_pool.shutdown)
+        await flush_langfuse()
+
+app = FastAPI(title="AI Contract Generator", description="Generate professional contracts with AI assistance", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -23,10 +68,12 @@ app.add_middleware(
 )
 
 class ContractRequest(BaseModel):
-    contract_type: str
-    number_of_words: int
-    party_a: str
-    party_b: str
+    # Constraints are enforced by pydantic-core without per-field Python callbacks.
+    # The word count floor matches the web form's minimum of 100, not the CLI's 500.
+    contract_type: Literal["lease_agreement", "outsourcing_contract"]
+    number_of_words: int = Field(ge=100)
+    party_a: str = Field(pattern=r"\S")  # must not be empty or whitespace
+    party_b: str = Field(pattern=r"\S")  # must not be empty or whitespace
     folder_to_save: str
 
 class SearchRequest(BaseModel):
@@ -52,32 +99,32 @@ async def contract(contract_request: ContractRequest):
     """Generate a contract based on the provided parameters"""
     return await async_main(contract_request)
 
+def _resolve_folder(folder: str) -> Optional[Path]:
+    """Resolve a folder once up front; returns None if it is not an existing directory"""
+    root = Path(folder).resolve()
+    return root if root.is_dir() else None
+
+def _list_txt_files(root: Path) -> List[str]:
+    """List the names of the .txt files directly inside a folder"""
+    return [entry.name for entry in iter_txt_entries(str(root))]
+
 @app.post("/search")
-async def search(search_request: SearchRequest):
+async def search(search_request: SearchRequest, request: Request):
     """Search for contracts containing specific text"""
     try:
-        if not os.path.exists(search_request.folder_to_search):
+        root = await anyio.to_thread.run_sync(_resolve_folder, search_request.folder_to_search)
+        if root is None:
             raise HTTPException(status_code=404, detail=f"Folder '{search_request.folder_to_search}' not found")
         
-        matching_files = search_txt_files(search_request.folder_to_search, search_request.query)
+        filenames = await anyio.to_thread.run_sync(_list_txt_files, root)
         
-        # Get file details
-        results = []
-        for filename in matching_files:
-            file_path = os.path.join(search_request.folder_to_search, filename)
-            if os.path.exists(file_path):
-                stat = os.stat(file_path)
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # Get a preview of the content around the search term
-                    preview = get_content_preview(content, search_request.query)
-                
-                results.append({
-                    "filename": filename,
-                    "size": stat.st_size,
-                    "modified": stat.st_mtime,
-                    "preview": preview
-                })
+        # Scan and preview every candidate in the process pool
+        loop = asyncio.get_running_loop()
+        loaded = await asyncio.gather(*[
+            loop.run_in_executor(request.app.state.search_pool, scan_and_preview, str(root), filename, search_request.query)
+            for filename in filenames
+        ])
+        results = [result for result in loaded if result is not None]
         
         return {
             "query": search_request.query,
@@ -85,75 +132,141 @@ async def search(search_request: SearchRequest):
             "total_matches": len(results),
             "results": results
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-def get_content_preview(content: str, search_term: str, context_length: int = 150) -> str:
-    """Get a preview of content around the search term"""
-    lower_content = content.lower()
-    lower_term = search_term.lower()
-    
-    index = lower_content.find(lower_term)
-    if index == -1:
-        return content[:context_length] + "..." if len(content) > context_length else content
-    
-    start = max(0, index - context_length // 2)
-    end = min(len(content), index + len(search_term) + context_length // 2)
-    
-    preview = content[start:end]
-    if start > 0:
-        preview = "..." + preview
-    if end < len(content):
-        preview = preview + "..."
-    
-    return preview
+# Files a streaming search scans at once; enough to keep every search worker busy
+_STREAM_IN_FLIGHT = (os.cpu_count() or 1) * 2
+
+@app.post("/search/stream")
+async def search_stream(search_request: SearchRequest, request: Request):
+    """Stream contracts containing specific text as JSON Lines while the folder is being scanned"""
+    root = await anyio.to_thread.run_sync(_resolve_folder, search_request.folder_to_search)
+    if root is None:
+        raise HTTPException(status_code=404, detail=f"Folder '{search_request.folder_to_search}' not found")
+
+    async def stream_results():
+        loop = asyncio.get_running_loop()
+        entries = iter_txt_entries(str(root))
+        pending = set()
+        listed = False
+        try:
+            while True:
+                # Keep up to _STREAM_IN_FLIGHT files scanning in the search pool, listing the
+                # folder in a worker thread so the event loop keeps serving other requests
+                while not listed and len(pending) < _STREAM_IN_FLIGHT:
+                    entry = await anyio.to_thread.run_sync(next, entries, None)
+                    if entry is None:
+                        listed = True
+                        break
+                    pending.add(loop.run_in_executor(
+                        request.app.state.search_pool, scan_and_preview, str(root), entry.name, search_request.query
+                    ))
+                if not pending:
+                    break
+                # Send results in the order the scans finish
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if result is not None:
+                        yield orjson.dumps(result) + b"\n"
+        finally:
+            # Runs when the client disconnects too: release the directory handle and drop queued scans
+            entries.close()
+            for future in pending:
+                future.cancel()
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+def _scan_contracts(folder: str, offset: int = 0, limit: Optional[int] = None) -> Tuple[List[Dict], int]:
+    """
+    Collect name, size and mtime of .txt files in a folder in a single scandir pass, newest first.
+    With a limit, only the newest offset + limit entries are kept while scanning.
+    Returns the requested page and the total number of contracts in the folder.
+    """
+    total = 0
+
+    def entries():
+        nonlocal total
+        for entry in iter_txt_entries(folder):
+            total += 1
+            yield entry.name, entry.stat()
+
+    def by_modified(item):
+        return item[1].st_mtime
+
+    if limit is None:
+        selected = sorted(entries(), key=by_modified, reverse=True)[offset:]
+    else:
+        selected = heapq.nlargest(offset + limit, entries(), key=by_modified)[offset:]
+
+    contracts = [
+        {
+            "filename": name,
+            "size": stat.st_size,
+            "modified": stat.st_mtime
+        }
+        for name, stat in selected
+    ]
+    return contracts, total
 
 @app.get("/contracts")
-async def list_contracts(folder: str = "contracts"):
-    """List all available contracts in a folder"""
+async def list_contracts(
+    folder: str = "contracts",
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+):
+    """List available contracts in a folder, newest first, optionally one page at a time"""
     try:
-        if not os.path.exists(folder):
-            return {"contracts": [], "total": 0}
-        
-        contracts = []
-        for filename in os.listdir(folder):
-            if filename.endswith('.txt'):
-                file_path = os.path.join(folder, filename)
-                stat = os.stat(file_path)
-                contracts.append({
-                    "filename": filename,
-                    "size": stat.st_size,
-                    "modified": stat.st_mtime
-                })
-        
-        # Sort by modification time (newest first)
-        contracts.sort(key=lambda x: x['modified'], reverse=True)
+        # A missing folder is an empty listing, with the same keys as any other page
+        if await anyio.to_thread.run_sync(os.path.exists, folder):
+            contracts, total = await anyio.to_thread.run_sync(_scan_contracts, folder, offset, limit)
+        else:
+            contracts, total = [], 0
         
         return {
             "contracts": contracts,
-            "total": len(contracts),
-            "folder": folder
+            "total": total,
+            "folder": folder,
+            "offset": offset,
+            "limit": limit
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _resolve_contract(folder: str, filename: str) -> Optional[Path]:
+    """Resolve a contract's path; returns None unless it is an existing file inside the contracts root"""
+    file_path = Path(folder, filename).resolve()
+    if not file_path.is_relative_to(_CONTRACTS_ROOT) or not file_path.is_file():
+        return None
+    return file_path
+
 @app.get("/contracts/{filename}")
 async def get_contract(filename: str, folder: str = "contracts"):
-    """Get the content of a specific contract"""
+    """Get the metadata of a specific contract; the text is served by /contracts/{filename}/raw"""
     try:
-        file_path = os.path.join(folder, filename)
-        if not os.path.exists(file_path):
+        file_path = await anyio.to_thread.run_sync(_resolve_contract, folder, filename)
+        if file_path is None:
             raise HTTPException(status_code=404, detail="Contract not found")
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        stat = os.stat(file_path)
+        stat = await anyio.to_thread.run_sync(os.stat, file_path)
         return {
             "filename": filename,
-            "content": content,
             "size": stat.st_size,
             "modified": stat.st_mtime
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/contracts/{filename}/raw")
+async def get_contract_raw(filename: str, folder: str = "contracts"):
+    """Stream the text of a specific contract straight from disk"""
+    file_path = await anyio.to_thread.run_sync(_resolve_contract, folder, filename)
+    if file_path is None:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    
+    return FileResponse(file_path, media_type="text/plain; charset=utf-8")
\ No newline at end of file
@@ -1,9 +1,9 @@
 import argparse
 import sys
-from dotenv import load_dotenv
+from core.env import load_env
 from langfuse import observe, get_client
 
-load_dotenv()
+load_env()
 
 def number_of_words_validator(value: str) -> int:
     """
@@ -21,19 +21,15 @@ def non_empty_string(value: str) -> str:
     """
     Validates that a string argument is not empty or just whitespace.
     """
-    if not value.strip():
+    # isspace() stops at the first non-whitespace character and, unlike strip(), makes no copy
+    if not value or value.isspace():
         raise argparse.ArgumentTypeError("This field cannot be empty or whitespace.")
     return value
 
-@observe
-def parse_args():
+def _build_parser() -> argparse.ArgumentParser:
     """
-    Parses command-line arguments for the contract generation script.
-
-    This function defines the expected arguments for the script using subparsers,
-    validates them, and handles SystemExit errors from argparse, logging them
-    to Langfuse. It also cleans the parsed arguments before returning them
-    to ensure only relevant parameters are propagated.
+    Builds the argument parser for the contract generation script,
+    with one subparser per command.
     """
     parser = argparse.ArgumentParser(
         description="Generate a Japanese business contract."
@@ -102,11 +98,26 @@ def parse_args():
         help="Type of review to perform (default: comprehensive)"
     )
 
+    return parser
+
+# Built once at import and reused by every parse_args call
+_PARSER = _build_parser()
+
+@observe
+def parse_args():
+    """
+    Parses command-line arguments for the contract generation script.
+
+    This function validates the arguments against the module-level parser
+    and handles SystemExit errors from argparse, logging them to Langfuse.
+    It also cleans the parsed arguments before returning them to ensure
+    only relevant parameters are propagated.
+    """
     try:
-        parsed_args = parser.parse_args()
+        parsed_args = _PARSER.parse_args()
         # If no subcommand is given, print help and exit
         if parsed_args.command is None:
-            parser.print_help()
+            _PARSER.print_help()
             sys.exit(1)
 
         # Return the parsed args with command attribute intact
@@ -1,12 +1,85 @@
-import json
+import asyncio
 import os
-from agents import Runner, RunConfig, ModelSettings
+import orjson
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from agents import Runner, RunConfig, ModelSettings, RunResult, ToolCallOutputItem
 from prompts.dispatcher import get_prompt
 from prompts.contract_prompt import build_filename
 from custom_agents.contract_agent import create_contract_agent
-from core.model_provider import OpenAIModelProvider
+from core.model_provider import get_model_provider
+from tools.save_tool import copy_document
 from langfuse import observe, get_client
 
+# Previously generated contracts keyed by (assembled prompt, save folder); values are the
+# saved file's (path, mtime_ns, size), so a contract edited after it was saved is not reused
+_GENERATION_CACHE_MAX_ENTRIES = 128
+_generation_cache: "OrderedDict[Tuple[str, str], Tuple[str, int, int]]" = OrderedDict()
+
+# Generations currently running, keyed like the cache; identical concurrent requests wait on them.
+# An Event rather than a shared Future, so a cancelled waiter cannot cancel it for everyone else.
+_in_flight_generations: Dict[Tuple[str, str], asyncio.Event] = {}
+
+def _saved_contract_entry(result: RunResult, folder_to_save: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Builds the cache entry for the contract a run saved. The path is taken from the
+    save tool's own output, not from the model's final text, and must lie inside the
+    save folder, so the model cannot point later cache hits at an arbitrary file.
+
+    Args:
+        result (RunResult): The finished agent run.
+        folder_to_save (str): The folder the contract was meant to be saved in.
+
+    Returns:
+        Optional[Tuple[str, int, int]]: The saved file's (path, mtime_ns, size), or None
+                                        if the run saved no usable contract.
+    """
+    root = Path(folder_to_save).resolve()
+    for item in reversed(result.new_items):
+        if not isinstance(item, ToolCallOutputItem) or not isinstance(item.output, str):
+            continue
+        try:
+            saved_path = orjson.loads(item.output).get("path")
+        except (orjson.JSONDecodeError, AttributeError):
+            continue
+        if not saved_path or not Path(saved_path).resolve().is_relative_to(root):
+            continue
+        try:
+            stat = os.stat(saved_path)
+        except FileNotFoundError:
+            return None
+        return saved_path, stat.st_mtime_ns, stat.st_size
+    return None
+
+def _reuse_cached_contract(cache_key: Tuple[str, str], filename: str) -> Optional[dict]:
+    """
+    Saves a copy of a previously generated contract under a new filename.
+
+    Args:
+        cache_key (Tuple[str, str]): The (prompt, folder) the contract was generated for.
+        filename (str): The filename to save the copy under.
+
+    Returns:
+        Optional[dict]: The save result, or None if there is no usable cached contract.
+    """
+    entry = _generation_cache.get(cache_key)
+    if entry is None:
+        return None
+    cached_path, mtime_ns, size = entry
+    try:
+        stat = os.stat(cached_path)
+        if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+            raise FileNotFoundError(cached_path)
+        saved = orjson.loads(copy_document(cached_path, filename, cache_key[1]))
+    except FileNotFoundError:
+        # The earlier contract was moved, deleted or edited; generate a fresh one
+        _generation_cache.pop(cache_key, None)
+        return None
+    _generation_cache.move_to_end(cache_key)
+    saved["copied_from"] = cached_path
+    return saved
+
 
 @observe
 async def run_contract(args: dict) -> str:
@@ -15,6 +88,8 @@ async def run_contract(args: dict) -> str:
 
     Orchestrates prompt generation, agent creation, and running the agent
     to generate and save a contract. Handles errors and updates Langfuse spans.
+    Identical requests that arrive while one is being generated wait for it
+    and reuse its contract instead of running the agent again.
 
     Args:
         args (dict): Dictionary with contract parameters (e.g., contract_type,
@@ -26,11 +101,54 @@ async def run_contract(args: dict) -> str:
     Raises:
         RuntimeError: If LLM output parsing fails or contract generation fails.
     """
-    langfuse = get_client()
-
     prompt = get_prompt(**args)
     filename = build_filename(**args)
-    agent = create_contract_agent(prompt, args.get("folder_to_save", "contracts"))
+    folder_to_save = args.get("folder_to_save", "contracts")
+    cache_key = (prompt, folder_to_save)
+
+    # Coalesce with an identical request that is already being generated
+    while (in_flight := _in_flight_generations.get(cache_key)) is not None:
+        await in_flight.wait()
+
+    generation_done = asyncio.Event()
+    _in_flight_generations[cache_key] = generation_done
+    try:
+        return await _generate_contract(args, prompt, filename, cache_key)
+    finally:
+        del _in_flight_generations[cache_key]
+        generation_done.set()
+
+
+async def _generate_contract(args: dict, prompt: str, filename: str, cache_key: Tuple[str, str]) -> str:
+    """
+    Reuses a cached contract for the prompt, or runs the contract agent to generate one.
+
+    Args:
+        args (dict): Dictionary with contract parameters.
+        prompt (str): The assembled contract prompt.
+        filename (str): The filename to save the contract under.
+        cache_key (Tuple[str, str]): The (prompt, folder) key of the request.
+
+    Returns:
+        str: Message indicating the success of the contract saving operation.
+
+    Raises:
+        RuntimeError: If LLM output parsing fails or contract generation fails.
+    """
+    langfuse = get_client()
+
+    # An identical prompt was already answered: copy that contract instead of calling the LLM again
+    cached = await asyncio.to_thread(_reuse_cached_contract, cache_key, filename)
+    if cached is not None:
+        langfuse.update_current_span(output={
+            "tool_message": cached["message"],
+            "filename": filename,
+            "copied_from": cached["copied_from"],
+            "cache_hit": True
+        })
+        return cached["message"]
+
+    agent = create_contract_agent(prompt, cache_key[1])
 
     # Calculate max_tokens dynamically based on requested number_of_words
     requested_words = args.get("number_of_words") # Get user's requested words
@@ -44,7 +162,7 @@ async def run_contract(args: dict) -> str:
 
     try:
         run_config = RunConfig(
-            model_provider=OpenAIModelProvider(),
+            model_provider=get_model_provider(),
             model_settings=ModelSettings(
                 temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.2")),
                 max_tokens=final_max_tokens,
@@ -63,10 +181,16 @@ async def run_contract(args: dict) -> str:
             run_config=run_config,
         )
 
-        output = json.loads(result.final_output)
+        output = orjson.loads(result.final_output)
         message = output.get("message", "No message returned from tool.")
         document_content = output.get("document_content", "Document content not found.")
 
+        cache_entry = await asyncio.to_thread(_saved_contract_entry, result, cache_key[1])
+        if cache_entry is not None:
+            _generation_cache[cache_key] = cache_entry
+            if len(_generation_cache) > _GENERATION_CACHE_MAX_ENTRIES:
+                _generation_cache.popitem(last=False)
+
         langfuse.update_current_span(output={
             "tool_message": message,
             "filename": filename,
@@ -75,11 +199,11 @@ async def run_contract(args: dict) -> str:
 
         return message
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         error_message = f"Failed to parse LLM output: {result.final_output}. Error: {e}"
         langfuse.update_current_span(level="ERROR", status_message=error_message)
         raise RuntimeError(error_message) from e
     except Exception as e:
         error_message = f"Contract generation failed: {e}"
         langfuse.update_current_span(level="ERROR", status_message=error_message)
-        raise RuntimeError(error_message)
\ No newline at end of file
+        raise RuntimeError(error_message)
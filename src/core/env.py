@@ -0,0 +1,17 @@
+import os
+from dotenv import load_dotenv
+
+# Set once the .env file has been loaded; inherited by spawned worker processes
+_DOTENV_LOADED = "_DOTENV_LOADED"
+
+def load_env() -> None:
+    """
+    Loads the .env file into the environment once per process tree.
+
+    The CLI, the contract runner and the API all load the environment at import;
+    only the first call searches for and parses .env, later calls return at once.
+    """
+    if os.environ.get(_DOTENV_LOADED):
+        return
+    load_dotenv()
+    os.environ[_DOTENV_LOADED] = "1"
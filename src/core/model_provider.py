@@ -1,5 +1,7 @@
 # src/core/model_provider.py
 import os
+import httpx
+from functools import lru_cache
 from langfuse.openai import openai
 from agents import (
     Model,
@@ -7,12 +9,23 @@ from agents import (
     OpenAIChatCompletionsModel,
 )
 
+# Keep idle connections to the API open between runs so later requests skip the TLS handshake;
+# the pool sizes stay at the openai client defaults
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=openai.DEFAULT_CONNECTION_LIMITS.max_connections,
+    max_keepalive_connections=openai.DEFAULT_CONNECTION_LIMITS.max_keepalive_connections,
+    keepalive_expiry=300,
+)
+
 class OpenAIModelProvider(ModelProvider):
     """
     Provides an OpenAI chat completions model for the agent.
     """
     def __init__(self): # Removed max_output_tokens from __init__
-        self.client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = openai.AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=openai.DefaultAsyncHttpxClient(limits=_HTTP_LIMITS),
+        )
         self.model_name = os.getenv("OPENAI_MODEL", "gpt-4o")
         self.temperature = float(os.getenv("OPENAI_TEMPERATURE", "0.2")) # Keep temperature here for default
 
@@ -26,4 +39,14 @@ class OpenAIModelProvider(ModelProvider):
         return OpenAIChatCompletionsModel(
             model=model_name or self.model_name,
             openai_client=self.client,
-        )
\ No newline at end of file
+        )
+
+@lru_cache(maxsize=1)
+def get_model_provider() -> OpenAIModelProvider:
+    """
+    Returns the process-wide model provider, creating it on first use.
+
+    Sharing one provider keeps a single AsyncOpenAI client (and its HTTP
+    connection pool) alive across requests instead of reconnecting per run.
+    """
+    return OpenAIModelProvider()
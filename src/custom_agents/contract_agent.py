@@ -1,12 +1,15 @@
+from functools import lru_cache
 from agents import Agent
 from tools.save_tool import save_str_to_disc
 
+@lru_cache(maxsize=64)
 def create_contract_agent(prompt: str, directory: str = "contracts") -> Agent:
     """
     Creates and configures an AI agent specifically for contract generation.
 
     The agent is initialized with a given set of instructions (prompt)
-    and registered with the `save_str_to_disc` tool.
+    and registered with the `save_str_to_disc` tool. Agents are cached per
+    (prompt, directory) since the same inputs always yield an equivalent agent.
 
     Args:
         prompt (str): The instructions for the agent, which dictate the
@@ -1,7 +1,12 @@
+import asyncio
+import hashlib
 import os
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from tools.document_reader import read_contract_file
 from agents import Agent, Runner, RunConfig, ModelSettings
-from core.model_provider import OpenAIModelProvider
+from core.model_provider import get_model_provider
 
 def create_contract_review_agent() -> Agent:
     """
@@ -29,6 +34,48 @@ Provide detailed analysis covering legal risks, contract terms, and improvement
         tools=[read_contract_file]
     )
 
+# Per-call review instruction; only the file path and review type vary
+_REVIEW_INSTRUCTION_TEMPLATE = """
+Please read the contract file at: {contract_file_path}
+
+After reading the file, analyze the contract content and provide a {review_type} review.
+
+Follow these steps:
+1. Use the read_contract_file tool to read the contract
+2. Analyze the contract content thoroughly
+3. Provide a detailed review based on the contract content
+
+Focus on Japanese business law compliance and practical recommendations.
+Present your analysis in professional Japanese format.
+"""
+
+# Exact-match cache of review outputs keyed by (file path, review type, SHA-256 of the file)
+_REVIEW_CACHE_MAX_ENTRIES = 128
+_review_cache: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+
+def _file_digest(file_path: str) -> Optional[str]:
+    """
+    Returns the SHA-256 hex digest of a file, or None if it cannot be read.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+@lru_cache(maxsize=1)
+def _review_run_config() -> RunConfig:
+    """
+    Returns the run configuration shared by all contract reviews, built on first use.
+    """
+    return RunConfig(
+        model_provider=get_model_provider(),
+        model_settings=ModelSettings(
+            temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.2")),
+            max_tokens=4000,
+        ),
+    )
+
 class ContractReviewAgent:
     """
     Contract Review Agent for analyzing Japanese business contracts.
@@ -52,39 +99,56 @@ class ContractReviewAgent:
             str: Detailed contract review analysis
         """
         
+        # Serve repeat reviews of an unchanged file straight from the cache
+        digest = await asyncio.to_thread(_file_digest, contract_file_path)
+        cache_key = (contract_file_path, review_type, digest)
+        if digest is not None and cache_key in _review_cache:
+            _review_cache.move_to_end(cache_key)
+            return _review_cache[cache_key]
+        
         try:
             # Create the review instruction
-            review_instruction = f"""
-Please read the contract file at: {contract_file_path}
-
-After reading the file, analyze the contract content and provide a {review_type} review.
-
-Follow these steps:
-1. Use the read_contract_file tool to read the contract
-2. Analyze the contract content thoroughly
-3. Provide a detailed review based on the contract content
-
-Focus on Japanese business law compliance and practical recommendations.
-Present your analysis in professional Japanese format.
-"""
-            
-            # Configure the runner
-            run_config = RunConfig(
-                model_provider=OpenAIModelProvider(),
-                model_settings=ModelSettings(
-                    temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.2")),
-                    max_tokens=4000,
-                ),            
+            review_instruction = _REVIEW_INSTRUCTION_TEMPLATE.format(
+                contract_file_path=contract_file_path,
+                review_type=review_type,
             )
             
             # Run the agent
             result = await Runner.run(
                 self.agent,
                 input=review_instruction,
-                run_config=run_config,
+                run_config=_review_run_config(),
             )
             
+            if digest is not None:
+                _review_cache[cache_key] = result.final_output
+                if len(_review_cache) > _REVIEW_CACHE_MAX_ENTRIES:
+                    _review_cache.popitem(last=False)
+            
             return result.final_output
             
         except Exception as e:
-            return f"Error during contract review: {str(e)}" 
\ No newline at end of file
+            return f"Error during contract review: {str(e)}"
+    
+    async def review_contracts(self, contract_file_paths: List[str], review_type: str = "comprehensive") -> List[str]:
+        """
+        Review several contract files concurrently over the shared model client.
+        
+        Args:
+            contract_file_paths (List[str]): Paths to the contract files to review
+            review_type (str): Type of review ("comprehensive", "summary", "risk_analysis")
+            
+        Returns:
+            List[str]: One review per file, in the order the paths were given
+        """
+        return list(await asyncio.gather(*(
+            self.review_contract(contract_file_path, review_type)
+            for contract_file_path in contract_file_paths
+        )))
+
+@lru_cache(maxsize=1)
+def get_review_agent() -> ContractReviewAgent:
+    """
+    Returns the process-wide contract review agent, creating it on first use.
+    """
+    return ContractReviewAgent()
@@ -1,13 +1,13 @@
 import asyncio
 from cli import parse_args
 from core.agent_runner import run_contract
-from custom_agents.contract_review_agent import ContractReviewAgent
+from custom_agents.contract_review_agent import get_review_agent
 from langfuse import get_client
-from dotenv import load_dotenv
+from core.env import load_env
 from pydantic import BaseModel
 from typing import List, Optional
 
-load_dotenv()
+load_env()
 
 async def async_main(contract_request: Optional[BaseModel] = None):
     """
@@ -22,25 +22,24 @@ async def async_main(contract_request: Optional[BaseModel] = None):
     with langfuse.start_as_current_span(name="app_run") as app_span:
         if contract_request is None:
             args = parse_args()
-            # Get the command BEFORE filtering args
-            command = getattr(args, 'command', 'generate_contract')
-            
-            # Filter out the 'command' argument which is not needed by run_contract's
+            # Take the 'command' argument out, as it is not needed by run_contract's
             # internal functions (like get_prompt and build_filename).
-            filtered_args = vars(args).copy()
-            if 'command' in filtered_args:
-                del filtered_args['command']
+            # vars() returns the namespace's own dict, so no copy is made.
+            filtered_args = vars(args)
+            command = filtered_args.pop('command', 'generate_contract')
         else:
             # contract_request.model_dump() already returns a dict, so use it directly
             filtered_args = contract_request.model_dump()
             command = 'generate_contract'  # Default for API calls
             
-        app_span.update_trace(input=filtered_args) # Correctly pass filtered args for trace input
+        # Span and trace updates are collected here and sent once when the run finishes
+        span_update = {}
+        trace_output = None
 
         try:
             if command == 'review_contract':
                 # Handle contract review
-                review_agent = ContractReviewAgent()
+                review_agent = get_review_agent()
                 contract_file = filtered_args.get('contract_file')
                 review_type = filtered_args.get('review_type', 'comprehensive')
                 
@@ -55,30 +54,36 @@ async def async_main(contract_request: Optional[BaseModel] = None):
                 print("=" * 50)
                 
                 message = f"Contract review completed for: {contract_file}"
-                app_span.update(output={"status": "success", "message": message, "review_result": result})
-                app_span.update_trace(output={"status": "success", "message": message})
+                span_update = {"output": {"status": "success", "message": message, "review_result": result}}
+                trace_output = {"status": "success", "message": message}
                 
             else:
                 # Handle contract generation (existing functionality)
                 message = await run_contract(filtered_args) # Pass filtered_args
                 print(f"Contract generation successful: {message}")
-                app_span.update(output={"status": "success", "message": message})
-                app_span.update_trace(output={"status": "success", "message": message})
+                span_update = {"output": {"status": "success", "message": message}}
+                trace_output = {"status": "success", "message": message}
                 
         except RuntimeError as e:
             print(f"Error: {e}")
-            app_span.update(level="ERROR", status_message=str(e)) # Correct for span update
-            # Removed 'level="ERROR"' from update_trace as it's not supported
-            app_span.update_trace(output={"status": "failed", "error": str(e)})
-
-    langfuse.flush()
+            span_update = {"level": "ERROR", "status_message": str(e)} # Correct for span update
+            # 'level' is not supported by update_trace, so only the output is recorded there
+            trace_output = {"status": "failed", "error": str(e)}
+        finally:
+            app_span.update_trace(input=filtered_args, output=trace_output)
+            if span_update:
+                app_span.update(**span_update)
 
 def main(contract_request: Optional[BaseModel] = None): 
     """
     Synchronous entry point for the command-line interface.
-    It runs the async_main coroutine using asyncio.
+    It runs the async_main coroutine using asyncio, then flushes pending
+    Langfuse spans once before the process exits.
     """
-    asyncio.run(async_main(contract_request))
+    try:
+        asyncio.run(async_main(contract_request))
+    finally:
+        get_client().flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
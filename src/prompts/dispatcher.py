@@ -1,10 +1,15 @@
-from prompts.contract_prompt import (
-    build_lease_agreement_prompt,
-    build_outsourcing_contract_prompt,
-)
+import os
+from prompts.contract_prompt import PROMPT_BUILDERS
 from langfuse import observe
 
-@observe(name="prompt-generation", as_type="function")
+# Prompt building takes microseconds, so its own span is opt-in; run_contract's span covers it otherwise
+_observe_prompt = (
+    observe(name="prompt-generation", as_type="function")
+    if os.getenv("LANGFUSE_TRACE_PROMPTS") == "1"
+    else (lambda func: func)
+)
+
+@_observe_prompt
 def get_prompt(**kwargs) -> str:
     """
     Dispatches to the appropriate prompt construction function based on contract type.
@@ -20,9 +25,9 @@ def get_prompt(**kwargs) -> str:
         ValueError: If an unknown contract_type is provided.
     """
     contract_type = kwargs.get("contract_type")
-    if contract_type == "lease_agreement":
-        return build_lease_agreement_prompt(**kwargs)
-    elif contract_type == "outsourcing_contract":
-        return build_outsourcing_contract_prompt(**kwargs)
-    else:
-        raise ValueError(f"Unknown contract_type: {contract_type}")
\ No newline at end of file
+    builder = PROMPT_BUILDERS.get(contract_type)
+    if builder is None:
+        raise ValueError(f"Unknown contract_type: {contract_type}")
+    # Pass the prompt inputs positionally so the builders' lru_cache key does not
+    # depend on keyword order or on fields the prompt ignores (e.g. folder_to_save).
+    return builder(contract_type, kwargs.get("number_of_words"), kwargs.get("party_a"), kwargs.get("party_b"))
\ No newline at end of file
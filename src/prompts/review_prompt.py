@@ -3,26 +3,17 @@ Contract Review Prompts for Japanese Business Contracts
 This module contains prompts for reviewing and analyzing Japanese business contracts.
 """
 
-def get_contract_review_prompt(contract_content: str, filename: str) -> str:
-    """
-    Generate a comprehensive review prompt for Japanese business contracts.
-    
-    Args:
-        contract_content (str): The content of the contract to review
-        filename (str): The name of the contract file being reviewed
-        
-    Returns:
-        str: A detailed prompt for contract review
-    """
-    
-    return f"""あなたは日本の法務に精通した契約書レビューの専門家です。以下の契約書を詳細に分析し、包括的なレビューを提供してください。
-
-契約書ファイル名: {filename}
+# The file name and contract text block shared by all review prompts
+_CONTRACT_BLOCK = """契約書ファイル名: {filename}
 
 契約書内容:
 {contract_content}
 
-以下の観点から契約書を分析してください：
+"""
+
+_REVIEW_TEMPLATE = """あなたは日本の法務に精通した契約書レビューの専門家です。以下の契約書を詳細に分析し、包括的なレビューを提供してください。
+
+""" + _CONTRACT_BLOCK + """以下の観点から契約書を分析してください：
 
 ## 1. 契約書の基本情報
 - 契約の種類と目的
@@ -81,26 +72,9 @@ def get_contract_review_prompt(contract_content: str, filename: str) -> str:
 
 専門的で実用的なレビューを提供し、契約当事者が適切な判断を下せるよう支援してください。"""
 
-def get_contract_summary_prompt(contract_content: str, filename: str) -> str:
-    """
-    Generate a prompt for creating a contract summary.
-    
-    Args:
-        contract_content (str): The content of the contract to summarize
-        filename (str): The name of the contract file
-        
-    Returns:
-        str: A prompt for contract summarization
-    """
-    
-    return f"""以下の契約書の要点を簡潔にまとめてください。
-
-契約書ファイル名: {filename}
+_SUMMARY_TEMPLATE = """以下の契約書の要点を簡潔にまとめてください。
 
-契約書内容:
-{contract_content}
-
-以下の形式で要約してください：
+""" + _CONTRACT_BLOCK + """以下の形式で要約してください：
 
 【契約書要約】
 
@@ -118,26 +92,9 @@ def get_contract_summary_prompt(contract_content: str, filename: str) -> str:
 
 簡潔で分かりやすい要約を作成してください。"""
 
-def get_risk_analysis_prompt(contract_content: str, filename: str) -> str:
-    """
-    Generate a prompt focused specifically on risk analysis.
-    
-    Args:
-        contract_content (str): The content of the contract to analyze
-        filename (str): The name of the contract file
-        
-    Returns:
-        str: A prompt for risk analysis
-    """
-    
-    return f"""以下の契約書について、法的リスクを中心とした分析を行ってください。
+_RISK_ANALYSIS_TEMPLATE = """以下の契約書について、法的リスクを中心とした分析を行ってください。
 
-契約書ファイル名: {filename}
-
-契約書内容:
-{contract_content}
-
-以下の観点からリスクを分析してください：
+""" + _CONTRACT_BLOCK + """以下の観点からリスクを分析してください：
 
 ## リスク分析
 
@@ -153,4 +110,46 @@ def get_risk_analysis_prompt(contract_content: str, filename: str) -> str:
 ### 推奨対応策
 - [各リスクに対する具体的な対応方法]
 
-リスクの優先順位を明確にし、実践的な対応策を提示してください。""" 
\ No newline at end of file
+リスクの優先順位を明確にし、実践的な対応策を提示してください。"""
+
+def get_contract_review_prompt(contract_content: str, filename: str) -> str:
+    """
+    Generate a comprehensive review prompt for Japanese business contracts.
+    
+    Args:
+        contract_content (str): The content of the contract to review
+        filename (str): The name of the contract file being reviewed
+        
+    Returns:
+        str: A detailed prompt for contract review
+    """
+    
+    return _REVIEW_TEMPLATE.format_map({"filename": filename, "contract_content": contract_content})
+
+def get_contract_summary_prompt(contract_content: str, filename: str) -> str:
+    """
+    Generate a prompt for creating a contract summary.
+    
+    Args:
+        contract_content (str): The content of the contract to summarize
+        filename (str): The name of the contract file
+        
+    Returns:
+        str: A prompt for contract summarization
+    """
+    
+    return _SUMMARY_TEMPLATE.format_map({"filename": filename, "contract_content": contract_content})
+
+def get_risk_analysis_prompt(contract_content: str, filename: str) -> str:
+    """
+    Generate a prompt focused specifically on risk analysis.
+    
+    Args:
+        contract_content (str): The content of the contract to analyze
+        filename (str): The name of the contract file
+        
+    Returns:
+        str: A prompt for risk analysis
+    """
+    
+    return _RISK_ANALYSIS_TEMPLATE.format_map({"filename": filename, "contract_content": contract_content})
\ No newline at end of file
@@ -1,20 +1,192 @@
 #searches txt files in a folder to find a specific string
 
+import mmap
 import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
 
-def search_txt_files(folder_path: str, search_string: str) -> str:
+def iter_txt_entries(folder_path: str) -> Iterator[os.DirEntry]:
+    """
+    Yields the directory entries of the .txt files directly inside a folder.
+    Every search and listing goes through this, so they all agree on which files count.
+    
+    Args:
+        folder_path (str): The path to the folder containing the .txt files.
+        
+    """
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if entry.name.endswith(".txt") and entry.is_file():
+                yield entry
+
+def file_contains(file_path: str, needle: bytes) -> bool:
+    """
+    Checks whether a file contains the given bytes by scanning a memory map of it,
+    without decoding the file or reading it into memory.
+    
+    Args:
+        file_path (str): The path to the file to scan.
+        needle (bytes): The UTF-8 encoded string to look for.
+        
+    """
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < len(needle):
+            return False
+        # Empty files cannot be memory-mapped
+        if size == 0:
+            return not needle
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm.find(needle) != -1
+
+def _entry_matches(entry: os.DirEntry, search_string: str, needle: bytes, filename_fast_path: bool) -> bool:
+    """
+    Checks one directory entry, skipping the file read whenever the answer is known without it.
+    """
+    if filename_fast_path and search_string in entry.name:
+        return True
+    # A file shorter than the needle cannot contain it, so don't open it
+    if entry.stat().st_size < len(needle):
+        return False
+    return file_contains(entry.path, needle)
+
+def iter_txt_file_matches(folder_path: str, search_string: str, filename_fast_path: bool = False) -> Iterator[str]:
+    """
+    Yields the names of .txt files within a given folder that contain a specific
+    string, one at a time as they are found.
+    
+    Args:
+        folder_path (str): The path to the folder containing the .txt files.
+        search_string (str): The string to search for in the .txt files.
+        filename_fast_path (bool): Also count files whose name contains the string
+                                   as matches, without reading them.
+        
+    """
+    needle = search_string.encode("utf-8")
+    for entry in iter_txt_entries(folder_path):
+        if _entry_matches(entry, search_string, needle, filename_fast_path):
+            yield entry.name
+
+def search_txt_files(folder_path: str, search_string: str, filename_fast_path: bool = False) -> List[str]:
     """
     Searches for a specific string in all .txt files within a given folder.
+    Files are scanned concurrently in a thread pool; file reads and mmap scans
+    release the GIL, so the scans overlap.
     
     Args:
         folder_path (str): The path to the folder containing the .txt files.
         search_string (str): The string to search for in the .txt files.
+        filename_fast_path (bool): Also count files whose name contains the string
+                                   as matches, without reading them.
         
     """
-    results = []
-    for file in os.listdir(folder_path):
-        if file.endswith(".txt"):
-            with open(os.path.join(folder_path, file), "r", encoding="utf-8") as f:
-                if search_string in f.read():
-                    results.append(file)
+    needle = search_string.encode("utf-8")
+    candidates = list(iter_txt_entries(folder_path))
+
+    def scan(entry: os.DirEntry) -> Optional[str]:
+        return entry.name if _entry_matches(entry, search_string, needle, filename_fast_path) else None
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        return [name for name in executor.map(scan, candidates) if name is not None]
+
+def _preview_around(mm: mmap.mmap, match_start: int, match_end: int, context_length: int) -> str:
+    """
+    Decodes the text around a match from a memory map, without decoding the rest of the file.
+    """
+    half = context_length // 2
+    # UTF-8 needs at most 4 bytes per character; one extra character absorbs a split sequence at the edge
+    margin = (half + 1) * 4
+    before = mm[max(0, match_start - margin):match_start].decode("utf-8", errors="ignore")
+    term = mm[match_start:match_end].decode("utf-8", errors="ignore")
+    after = mm[match_end:match_end + margin].decode("utf-8", errors="ignore")
+
+    preview = (before[-half:] if half else "") + term + after[:half]
+    if len(before) > half:
+        preview = "..." + preview
+    if len(after) > half:
+        preview = preview + "..."
+    return preview
+
+def scan_and_preview(root: str, filename: str, search_string: str, context_length: int = 150) -> Optional[Dict]:
+    """
+    Searches one file and builds its search result if it contains the string.
+    The preview is cut from the same memory map the match was found in, so each
+    file is opened and mapped once. Kept free of the web app's imports, so it can
+    run in a spawned worker process.
+    
+    Args:
+        root (str): The resolved folder being searched.
+        filename (str): The name of the file within the folder.
+        search_string (str): The string to search for.
+        context_length (int): The number of characters of context around the match.
+        
+    Returns:
+        Optional[Dict]: The file's name, size, mtime and preview, or None if it does not
+                        match, has been removed, or resolves outside the folder.
+    """
+    file_path = Path(root, filename).resolve()
+    if not file_path.is_relative_to(root):
+        return None
+    needle = search_string.encode("utf-8")
+    try:
+        with open(file_path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size < len(needle):
+                return None
+            # Empty files cannot be memory-mapped; only an empty string matches them
+            if stat.st_size == 0:
+                preview = ""
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    index = mm.find(needle)
+                    if index == -1:
+                        return None
+                    preview = _preview_around(mm, index, index + len(needle), context_length)
+    except FileNotFoundError:
+        # Removed between the listing and the scan
+        return None
+
+    return {
+        "filename": filename,
+        "size": stat.st_size,
+        "modified": stat.st_mtime,
+        "preview": preview
+    }
+
+def _matching_strings(file_path: str, needles: Dict[str, bytes]) -> List[str]:
+    """
+    Returns which of the search strings a file contains, mapping the file once for all of them.
+    """
+    with open(file_path, "rb") as f:
+        # Empty files cannot be memory-mapped; only an empty string matches them
+        if os.fstat(f.fileno()).st_size == 0:
+            return [search_string for search_string, needle in needles.items() if not needle]
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return [search_string for search_string, needle in needles.items() if mm.find(needle) != -1]
+
+def search_txt_files_multi(folder_path: str, search_strings: List[str]) -> Dict[str, List[str]]:
+    """
+    Searches for several strings at once in all .txt files within a given folder.
+    Each file is opened and mapped once for all the strings, instead of once per
+    string as calling search_txt_files in a loop would.
+    
+    Args:
+        folder_path (str): The path to the folder containing the .txt files.
+        search_strings (List[str]): The strings to search for in the .txt files.
+        
+    Returns:
+        Dict[str, List[str]]: The names of the matching files for each search string.
+    """
+    needles = {search_string: search_string.encode("utf-8") for search_string in search_strings}
+    candidates = list(iter_txt_entries(folder_path))
+
+    def scan(entry: os.DirEntry) -> List[str]:
+        return _matching_strings(entry.path, needles)
+
+    results: Dict[str, List[str]] = {search_string: [] for search_string in needles}
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        for entry, matched in zip(candidates, executor.map(scan, candidates)):
+            for search_string in matched:
+                results[search_string].append(entry.name)
     return results
\ No newline at end of file
@@ -1,11 +1,23 @@
 import os
+import stat
+from functools import lru_cache
 from agents import function_tool
-import json
+import orjson
 from langfuse import observe
 
+@lru_cache(maxsize=128)
+def _read_text(file_path: str, mtime_ns: int, size: int) -> str:
+    """
+    Reads a UTF-8 text file. Cached per (path, mtime, size), so reviewing an
+    unchanged file again skips the disk read while any edit invalidates the entry.
+    """
+    # Read the raw bytes in one call and decode once, skipping text-mode I/O
+    with open(file_path, 'rb') as f:
+        return f.read().decode('utf-8')
+
 @function_tool
 @observe
-def read_contract_file(file_path: str) -> dict:
+def read_contract_file(file_path: str) -> str:
     """
     Read a contract file from the specified path and return its content.
     This function reads text files (typically contracts) and returns the content
@@ -15,61 +27,64 @@ def read_contract_file(file_path: str) -> dict:
         file_path (str): The path to the contract file to be read.
 
     Returns:
-        dict: A dictionary containing the file content, filename, and status.
+        str: A JSON object containing the file content, filename, and status.
+             The agent SDK passes tool results to the model with str(), so the
+             result is serialized here (with orjson) rather than returned as a dict.
     """
+    filename = os.path.basename(file_path)
+
     try:
-        # Check if file exists
-        if not os.path.exists(file_path):
-            return json.dumps({
+        # A single stat both checks that the file exists and that it is a regular file
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            return orjson.dumps({
                 "success": False,
                 "error": f"File not found: {file_path}",
                 "content": "",
                 "filename": ""
-            }, ensure_ascii=False)
+            }).decode()
         
         # Check if it's a file (not directory)
-        if not os.path.isfile(file_path):
-            return json.dumps({
+        if not stat.S_ISREG(file_stat.st_mode):
+            return orjson.dumps({
                 "success": False,
                 "error": f"Path is not a file: {file_path}",
                 "content": "",
                 "filename": ""
-            }, ensure_ascii=False)
+            }).decode()
         
         # Read the file content
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        filename = os.path.basename(file_path)
+        content = _read_text(file_path, file_stat.st_mtime_ns, file_stat.st_size)
         
-        return json.dumps({
+        return orjson.dumps({
             "success": True,
             "content": content,
             "filename": filename,
             "file_path": file_path,
             "message": f"Successfully read contract file: {filename}"
-        }, ensure_ascii=False)
+        }).decode()
         
     except UnicodeDecodeError:
-        return json.dumps({
+        return orjson.dumps({
             "success": False,
             "error": f"Unable to read file as UTF-8: {file_path}. Please ensure the file contains text.",
             "content": "",
-            "filename": os.path.basename(file_path) if os.path.exists(file_path) else ""
-        }, ensure_ascii=False)
+            "filename": filename
+        }).decode()
         
     except PermissionError:
-        return json.dumps({
+        return orjson.dumps({
             "success": False,
             "error": f"Permission denied reading file: {file_path}",
             "content": "",
-            "filename": os.path.basename(file_path) if os.path.exists(file_path) else ""
-        }, ensure_ascii=False)
+            "filename": filename
+        }).decode()
         
     except Exception as e:
-        return json.dumps({
+        return orjson.dumps({
             "success": False,
             "error": f"Unexpected error reading file: {str(e)}",
             "content": "",
-            "filename": os.path.basename(file_path) if os.path.exists(file_path) else ""
-        }, ensure_ascii=False) 
\ No newline at end of file
+            "filename": filename
+        }).decode()
\ No newline at end of file
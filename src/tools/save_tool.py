@@ -1,44 +1,177 @@
+import asyncio
 import os
+import secrets
+import shutil
+from collections import OrderedDict
+from contextlib import contextmanager, suppress
+from typing import IO, Iterator, Optional, Set, Tuple
 from agents import function_tool
-import json
+import orjson
 from langfuse import observe
 
-def get_unique_filename(base: str, ext: str, directory: str) -> str:
+# Write buffer for saved contracts; 64 KiB holds a typical contract in one write() call
+_WRITE_BUFFER_SIZE = 1 << 16
+
+# Directories already created (or found to exist) by this process
+_ensured_dirs: Set[str] = set()
+
+def _ensure_dir(directory: str) -> None:
     """
-    Generate a unique file path by appending an incremental index if needed.
-    Ensures that the file does not overwrite an existing one by adding a counter.
+    Creates the directory if needed. Each directory is only created once per process,
+    so repeated saves into the same folder skip the mkdir syscall.
+    """
+    if directory in _ensured_dirs:
+        return
+    os.makedirs(directory, exist_ok=True)
+    _ensured_dirs.add(directory)
 
-    Args:
-        base (str): The base name of the file (without extension).
-        ext (str): The file extension (e.g., ".txt", ".json").
-        directory (str): The directory where the file is intended to be saved.
+# O_BINARY (Windows only) stops the C runtime from translating newlines
+_CREATE_FLAGS = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
 
-    Returns:
-        str: A unique file path that does not currently exist.
+@contextmanager
+def _open_directory(directory: str) -> Iterator[Optional[int]]:
+    """
+    Opens the save directory for the duration of one save. The name claim, the
+    temporary file and the rename all go through this one descriptor, so they land
+    in the same directory even if its path is moved or recreated meanwhile.
+    Yields None where directories cannot be opened (Windows); the save then uses paths.
+    A directory removed since _ensure_dir cached it is created again.
+    """
+    if os.open not in os.supports_dir_fd:
+        if not os.path.isdir(directory):
+            _ensured_dirs.discard(directory)
+            _ensure_dir(directory)
+        yield None
+        return
+    flags = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_CLOEXEC", 0)
+    try:
+        dir_fd = os.open(directory, flags)
+    except FileNotFoundError:
+        _ensured_dirs.discard(directory)
+        _ensure_dir(directory)
+        dir_fd = os.open(directory, flags)
+    try:
+        yield dir_fd
+    finally:
+        os.close(dir_fd)
+
+def _in_directory(directory: str, dir_fd: Optional[int], name: str) -> str:
+    """
+    Returns what to pass for a file in the save directory: the bare name when it is
+    resolved against dir_fd, the full path otherwise.
+    """
+    return name if dir_fd is not None else os.path.join(directory, name)
+
+# Next counter to try for each (directory, base, extension), bounded as an LRU
+_NEXT_INDEX_MAX_ENTRIES = 1024
+_next_index: "OrderedDict[Tuple[str, str, str], int]" = OrderedDict()
+
+def _candidate_name(base: str, ext: str, counter: int) -> str:
+    """
+    Returns the file name for a counter value; 0 is the plain, unnumbered name.
+    """
+    if counter == 0:
+        return f"{base}{ext}"
+    return f"{base}_{counter:03d}{ext}"
+
+def _name_taken(directory: str, dir_fd: Optional[int], name: str) -> bool:
+    """
+    Checks whether a name already exists in the save directory.
+    """
+    try:
+        os.stat(_in_directory(directory, dir_fd, name), dir_fd=dir_fd, follow_symlinks=False)
+    except FileNotFoundError:
+        return False
+    return True
+
+def _first_free_index(base: str, ext: str, directory: str, dir_fd: Optional[int]) -> int:
+    """
+    Finds the first free numbered counter for a name whose plain form is taken.
+    Saved copies fill the counters from the bottom up, so the range is probed at
+    1, 2, 4, 8, ... and the last gap is binary-searched: O(log N) stats for N copies.
+    """
+    taken, free = 0, 1
+    while _name_taken(directory, dir_fd, _candidate_name(base, ext, free)):
+        taken, free = free, free * 2
+    while free - taken > 1:
+        middle = (taken + free) // 2
+        if _name_taken(directory, dir_fd, _candidate_name(base, ext, middle)):
+            taken = middle
+        else:
+            free = middle
+    return free
+
+def _create_unique_file(base: str, ext: str, directory: str, dir_fd: Optional[int]) -> Tuple[int, str]:
+    """
+    Creates a new, uniquely named file in the save directory and returns its open
+    descriptor and name. Each candidate name is claimed with O_CREAT | O_EXCL, so the
+    existence check and the create are one syscall, and two concurrent saves can never
+    pick the same name. The next counter for each name is remembered, so repeated
+    saves start at a free slot.
     """
     ext = ext if ext else ".txt"
     base = base.rstrip('.')  # Avoid double dots like 'file..txt'
 
-    os.makedirs(directory, exist_ok=True)
-    path = os.path.join(directory, f"{base}{ext}")
-    
-    if not os.path.exists(path):
-        return path
-
-    counter = 1
+    key = (directory, base, ext)
+    # Without a remembered counter, the plain name is tried first: the O_EXCL open
+    # doubles as the existence check, so the common no-collision save is one syscall
+    counter = _next_index.get(key)
+    searched = counter is not None
+    if counter is None:
+        counter = 0
     while True:
-        alt_name = f"{base}_{counter:03d}{ext}"
-        alt_path = os.path.join(directory, alt_name)
-        if not os.path.exists(alt_path):
-            return alt_path
-        counter += 1
+        name = _candidate_name(base, ext, counter)
+        try:
+            fd = os.open(_in_directory(directory, dir_fd, name), _CREATE_FLAGS, 0o644, dir_fd=dir_fd)
+        except FileExistsError:
+            if searched:
+                counter += 1
+            else:
+                counter = _first_free_index(base, ext, directory, dir_fd)
+                searched = True
+            continue
 
-@function_tool
-@observe
-def save_str_to_disc(document: str, filename: str, directory: str = "contracts") -> dict:
+        _next_index[key] = counter + 1
+        _next_index.move_to_end(key)
+        if len(_next_index) > _NEXT_INDEX_MAX_ENTRIES:
+            _next_index.popitem(last=False)
+        return fd, name
+
+@contextmanager
+def _durable_write(fd: int, directory: str, dir_fd: Optional[int], name: str, mode: str, **open_kwargs) -> Iterator[IO]:
+    """
+    Writes the contents of a freshly claimed file through a temporary file in the
+    same directory. The data is fsynced and then renamed over the claimed name, so
+    after a crash the name holds either the complete document or an empty file,
+    never a truncated one. The claimed file is removed again if writing fails.
+    """
+    os.close(fd)
+    target = _in_directory(directory, dir_fd, name)
+    # Created like the claimed file, so the rename keeps its permissions
+    tmp = _in_directory(directory, dir_fd, f".{name}.{secrets.token_hex(8)}.tmp")
+    tmp_fd = os.open(tmp, _CREATE_FLAGS, 0o644, dir_fd=dir_fd)
+    try:
+        with os.fdopen(tmp_fd, mode, **open_kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, target, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp, dir_fd=dir_fd)
+        with suppress(FileNotFoundError):
+            os.unlink(target, dir_fd=dir_fd)
+        raise
+    # Flush the directory entry too, so the rename itself survives a crash;
+    # Windows cannot open directories, so there is nothing to flush there
+    if dir_fd is not None:
+        os.fsync(dir_fd)
+
+def save_document(document: str, filename: str, directory: str = "contracts") -> str:
     """
     Save the document string to a uniquely named file in the given directory.
-    This function generates a unique filename to prevent overwriting existing files.
+    Plain-function form of `save_str_to_disc` for callers outside the agent.
+    The write is atomic and fsynced, so a crash never leaves a truncated contract.
 
     Args:
         document (str): The string content to be saved to the file.
@@ -47,20 +180,76 @@ def save_str_to_disc(document: str, filename: str, directory: str = "contracts")
                                    Defaults to "contracts".
 
     Returns:
-        dict: A dictionary containing the final filename, the full path to the file,
-              and a success message.
+        str: A JSON string with the final filename, the full path to the file,
+             and a success message.
     """
+    # Encode once up front and write the bytes in a single call, skipping the
+    # text layer's chunked encoding; a bad document also fails before a name is claimed
+    data = document.encode('utf-8')
     base, ext = os.path.splitext(filename)
-    os.makedirs(directory, exist_ok=True)
-    path = get_unique_filename(base, ext, directory)
+    _ensure_dir(directory)
+    with _open_directory(directory) as dir_fd:
+        fd, name = _create_unique_file(base, ext, directory, dir_fd)
+        with _durable_write(fd, directory, dir_fd, name, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            # Reserve the blocks of large contracts up front so they are laid out in one extent
+            if len(data) > _WRITE_BUFFER_SIZE and hasattr(os, "posix_fallocate"):
+                with suppress(OSError):  # Not every filesystem supports preallocation
+                    os.posix_fallocate(f.fileno(), 0, len(data))
+            f.write(data)
+
+    return _saved_result(os.path.join(directory, name), name, directory)
+
+def copy_document(source_path: str, filename: str, directory: str = "contracts") -> str:
+    """
+    Copy an already saved document to a uniquely named file in the given directory.
+    The file is copied on disk in chunks, so the contract is never loaded into memory.
 
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write(document)
+    Args:
+        source_path (str): The path of the saved document to copy.
+        filename (str): The desired base filename (e.g., "my_contract.txt").
+        directory (str, optional): The directory where the copy will be saved.
+                                   Defaults to "contracts".
 
-    final_name = os.path.basename(path)
-    
-    return json.dumps({
-        "filename": final_name,
+    Returns:
+        str: A JSON string with the final filename, the full path to the file,
+             and a success message.
+    """
+    base, ext = os.path.splitext(filename)
+    _ensure_dir(directory)
+    # Open the source first so a missing cached file does not leave an empty copy behind
+    with open(source_path, 'rb') as src, _open_directory(directory) as dir_fd:
+        fd, name = _create_unique_file(base, ext, directory, dir_fd)
+        with _durable_write(fd, directory, dir_fd, name, 'wb', buffering=_WRITE_BUFFER_SIZE) as dst:
+            shutil.copyfileobj(src, dst, _WRITE_BUFFER_SIZE)
+
+    return _saved_result(os.path.join(directory, name), name, directory)
+
+def _saved_result(path: str, name: str, directory: str) -> str:
+    """
+    Builds the JSON result reported for a document saved under the given path and name.
+    """
+    return orjson.dumps({
+        "filename": name,
         "path": path,
-        "message": f"Contract saved in `{directory}` as `{final_name}`"
-    }, ensure_ascii=False)
\ No newline at end of file
+        "message": f"Contract saved in `{directory}` as `{name}`"
+    }).decode()
+
+@function_tool
+@observe
+async def save_str_to_disc(document: str, filename: str, directory: str = "contracts") -> str:
+    """
+    Save the document string to a uniquely named file in the given directory.
+    This function generates a unique filename to prevent overwriting existing files.
+    The write runs in a worker thread so concurrent agent runs are not blocked on disk I/O.
+
+    Args:
+        document (str): The string content to be saved to the file.
+        filename (str): The desired base filename (e.g., "my_contract.txt").
+        directory (str, optional): The directory where the file will be saved.
+                                   Defaults to "contracts".
+
+    Returns:
+        str: A JSON object containing the final filename, the full path to the file,
+             and a success message.
+    """
+    return await asyncio.to_thread(save_document, document, filename, directory)
\ No newline at end of file
@@ -0,0 +1,6 @@
+import os
+
+# Keep the Langfuse SDK from exporting traces while the tests run; set before any
+# test module imports the app, so every client created in the session picks it up.
+# Tests that check tracing patch get_client explicitly.
+os.environ.setdefault("LANGFUSE_TRACING_ENABLED", "False")
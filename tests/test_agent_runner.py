@@ -3,7 +3,18 @@ import json
 import os
 from unittest.mock import patch, MagicMock, AsyncMock
 from src.core.agent_runner import run_contract
-from agents import Runner, RunConfig, ModelSettings
+from agents import Runner, RunConfig, ModelSettings, ToolCallOutputItem
+
+
+def saved_run_result(path, final_output=None):
+    """Build a run result whose save tool call wrote the contract to path."""
+    output = json.dumps({"message": "Contract saved", "path": str(path)})
+    tool_output = ToolCallOutputItem(
+        agent=MagicMock(),
+        raw_item={"type": "function_call_output", "call_id": "call_1", "output": output},
+        output=output
+    )
+    return MagicMock(final_output=final_output or output, new_items=[tool_output])
 
 
 class TestRunContract:
@@ -417,4 +428,220 @@ class TestRunContractEdgeCases:
             # Should be capped at model limit
             call_args = mock_runner_run.call_args[1]
             run_config = call_args['run_config']
-            assert run_config.model_settings.max_tokens == 8192  # Model hard limit 
\ No newline at end of file
+            assert run_config.model_settings.max_tokens == 8192  # Model hard limit 
+
+class TestRunContractCache:
+    """Test suite for reusing contracts generated from an identical prompt."""
+    
+    def setup_method(self):
+        """Setup method run before each test."""
+        from src.core import agent_runner
+        self.cache = agent_runner._generation_cache
+        self.cache.clear()
+    
+    def teardown_method(self):
+        """Cleanup after each test."""
+        self.cache.clear()
+    
+    @pytest.mark.asyncio
+    @patch('src.core.agent_runner.get_model_provider')
+    @patch('src.core.agent_runner.get_client')
+    @patch('src.core.agent_runner.Runner.run')
+    @patch('src.core.agent_runner.create_contract_agent')
+    @patch('src.core.agent_runner.build_filename')
+    @patch('src.core.agent_runner.get_prompt')
+    async def test_identical_prompt_reuses_saved_contract(self, mock_get_prompt, mock_build_filename,
+                                                          mock_create_agent, mock_runner_run, mock_get_client,
+                                                          mock_get_provider, tmp_path):
+        """Test that a repeated prompt copies the earlier contract instead of calling the LLM."""
+        first_path = tmp_path / "contract_first.txt"
+        first_path.write_text("契約書\n\n第1条（目的）", encoding="utf-8")
+        mock_get_prompt.return_value = "Same prompt"
+        mock_build_filename.return_value = "contract_second.txt"
+        mock_runner_run.return_value = saved_run_result(first_path)
+        
+        args = {
+            "contract_type": "lease_agreement",
+            "number_of_words": 1000,
+            "party_a": "LayerX Corp",
+            "party_b": "Tenant Company",
+            "folder_to_save": str(tmp_path)
+        }
+        
+        await run_contract(args)
+        message = await run_contract(args)
+        
+        assert mock_runner_run.call_count == 1
+        assert "contract_second.txt" in message
+        assert (tmp_path / "contract_second.txt").read_text(encoding="utf-8") == "契約書\n\n第1条（目的）"
+    
+    @pytest.mark.asyncio
+    @patch('src.core.agent_runner.get_model_provider')
+    @patch('src.core.agent_runner.get_client')
+    @patch('src.core.agent_runner.Runner.run')
+    @patch('src.core.agent_runner.create_contract_agent')
+    @patch('src.core.agent_runner.build_filename')
+    @patch('src.core.agent_runner.get_prompt')
+    async def test_deleted_contract_is_regenerated(self, mock_get_prompt, mock_build_filename,
+                                                   mock_create_agent, mock_runner_run, mock_get_client,
+                                                   mock_get_provider, tmp_path):
+        """Test that a cached contract removed from disk triggers a fresh generation."""
+        first_path = tmp_path / "contract_first.txt"
+        first_path.write_text("契約書", encoding="utf-8")
+        mock_get_prompt.return_value = "Same prompt"
+        mock_build_filename.return_value = "contract.txt"
+        mock_runner_run.return_value = saved_run_result(first_path)
+        
+        args = {"contract_type": "lease_agreement", "number_of_words": 1000, "folder_to_save": str(tmp_path)}
+        
+        await run_contract(args)
+        first_path.unlink()
+        await run_contract(args)
+        
+        assert mock_runner_run.call_count == 2
+    
+    @pytest.mark.asyncio
+    @patch('src.core.agent_runner.get_model_provider')
+    @patch('src.core.agent_runner.get_client')
+    @patch('src.core.agent_runner.Runner.run')
+    @patch('src.core.agent_runner.create_contract_agent')
+    @patch('src.core.agent_runner.build_filename')
+    @patch('src.core.agent_runner.get_prompt')
+    async def test_edited_contract_is_regenerated(self, mock_get_prompt, mock_build_filename,
+                                                  mock_create_agent, mock_runner_run, mock_get_client,
+                                                  mock_get_provider, tmp_path):
+        """Test that a cached contract changed on disk is not copied into a new request."""
+        first_path = tmp_path / "contract_first.txt"
+        first_path.write_text("契約書", encoding="utf-8")
+        mock_get_prompt.return_value = "Same prompt"
+        mock_build_filename.return_value = "contract.txt"
+        mock_runner_run.return_value = saved_run_result(first_path)
+        
+        args = {"contract_type": "lease_agreement", "number_of_words": 1000, "folder_to_save": str(tmp_path)}
+        
+        await run_contract(args)
+        first_path.write_text("契約書（改訂版）", encoding="utf-8")
+        await run_contract(args)
+        
+        assert mock_runner_run.call_count == 2
+        assert not (tmp_path / "contract.txt").exists()
+    
+    @pytest.mark.asyncio
+    @patch('src.core.agent_runner.get_model_provider')
+    @patch('src.core.agent_runner.get_client')
+    @patch('src.core.agent_runner.Runner.run')
+    @patch('src.core.agent_runner.create_contract_agent')
+    @patch('src.core.agent_runner.build_filename')
+    @patch('src.core.agent_runner.get_prompt')
+    async def test_path_outside_folder_is_not_cached(self, mock_get_prompt, mock_build_filename,
+                                                     mock_create_agent, mock_runner_run, mock_get_client,
+                                                     mock_get_provider, tmp_path):
+        """Test that a saved path outside folder_to_save is never reused."""
+        outside_path = tmp_path / "outside.txt"
+        outside_path.write_text("社外秘", encoding="utf-8")
+        folder = tmp_path / "contracts"
+        folder.mkdir()
+        mock_get_prompt.return_value = "Same prompt"
+        mock_build_filename.return_value = "contract.txt"
+        mock_runner_run.return_value = saved_run_result(outside_path)
+        
+        args = {"contract_type": "lease_agreement", "number_of_words": 1000, "folder_to_save": str(folder)}
+        
+        await run_contract(args)
+        await run_contract(args)
+        
+        assert mock_runner_run.call_count == 2
+        assert self.cache == {}
+    
+    @pytest.mark.asyncio
+    @patch('src.core.agent_runner.get_model_provider')
+    @patch('src.core.agent_runner.get_client')
+    @patch('src.core.agent_runner.Runner.run')
+    @patch('src.core.agent_runner.create_contract_agent')
+    @patch('src.core.agent_runner.build_filename')
+    @patch('src.core.agent_runner.get_prompt')
+    async def test_path_only_in_final_output_is_not_cached(self, mock_get_prompt, mock_build_filename,
+                                                           mock_create_agent, mock_runner_run, mock_get_client,
+                                                           mock_get_provider, tmp_path):
+        """Test that a path the model reports without a save tool call is never reused."""
+        first_path = tmp_path / "contract_first.txt"
+        first_path.write_text("契約書", encoding="utf-8")
+        mock_get_prompt.return_value = "Same prompt"
+        mock_build_filename.return_value = "contract.txt"
+        mock_runner_run.return_value = MagicMock(
+            final_output=json.dumps({"message": "Contract saved", "path": str(first_path)}),
+            new_items=[]
+        )
+        
+        args = {"contract_type": "lease_agreement", "number_of_words": 1000, "folder_to_save": str(tmp_path)}
+        
+        await run_contract(args)
+        await run_contract(args)
+        
+        assert mock_runner_run.call_count == 2
+        assert self.cache == {}
+    
+    @pytest.mark.asyncio
+    @patch('src.core.agent_runner.get_model_provider')
+    @patch('src.core.agent_runner.get_client')
+    @patch('src.core.agent_runner.Runner.run')
+    @patch('src.core.agent_runner.create_contract_agent')
+    @patch('src.core.agent_runner.build_filename')
+    @patch('src.core.agent_runner.get_prompt')
+    async def test_concurrent_identical_requests_share_one_generation(self, mock_get_prompt, mock_build_filename,
+                                                                      mock_create_agent, mock_runner_run, mock_get_client,
+                                                                      mock_get_provider, tmp_path):
+        """Test that identical requests arriving together run the agent only once."""
+        import asyncio
+        first_path = tmp_path / "contract.txt"
+        mock_get_prompt.return_value = "Same prompt"
+        mock_build_filename.return_value = "contract.txt"
+        
+        async def slow_run(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            first_path.write_text("契約書", encoding="utf-8")
+            return saved_run_result(first_path)
+        mock_runner_run.side_effect = slow_run
+        
+        args = {"contract_type": "lease_agreement", "number_of_words": 1000, "folder_to_save": str(tmp_path)}
+        
+        await asyncio.gather(run_contract(args), run_contract(args))
+        
+        assert mock_runner_run.call_count == 1
+        assert (tmp_path / "contract_001.txt").read_text(encoding="utf-8") == "契約書"
+    
+    @pytest.mark.asyncio
+    @patch('src.core.agent_runner.get_model_provider')
+    @patch('src.core.agent_runner.get_client')
+    @patch('src.core.agent_runner.Runner.run')
+    @patch('src.core.agent_runner.create_contract_agent')
+    @patch('src.core.agent_runner.build_filename')
+    @patch('src.core.agent_runner.get_prompt')
+    async def test_cancelled_waiter_does_not_fail_the_others(self, mock_get_prompt, mock_build_filename,
+                                                             mock_create_agent, mock_runner_run, mock_get_client,
+                                                             mock_get_provider, tmp_path):
+        """Test that cancelling one waiting request leaves the generation and the other waiters intact."""
+        import asyncio
+        first_path = tmp_path / "contract.txt"
+        mock_get_prompt.return_value = "Same prompt"
+        mock_build_filename.return_value = "contract.txt"
+        
+        async def slow_run(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            first_path.write_text("契約書", encoding="utf-8")
+            return saved_run_result(first_path)
+        mock_runner_run.side_effect = slow_run
+        
+        args = {"contract_type": "lease_agreement", "number_of_words": 1000, "folder_to_save": str(tmp_path)}
+        
+        owner = asyncio.create_task(run_contract(args))
+        waiters = [asyncio.create_task(run_contract(args)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        
+        owner_message, waiter_message = await asyncio.gather(owner, waiters[1])
+        
+        assert waiters[0].cancelled()
+        assert owner_message == "Contract saved"
+        assert "contract_001.txt" in waiter_message
+        assert mock_runner_run.call_count == 1
@@ -0,0 +1,167 @@
+import pytest
+import json
+from fastapi.testclient import TestClient
+import api
+from api import app
+
+
+@pytest.fixture
+def client():
+    """A test client for the app; startup and shutdown hooks are not run."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def contracts_root(tmp_path, monkeypatch):
+    """Makes a temporary folder the only one the /contracts endpoints may read from."""
+    root = tmp_path / "contracts"
+    root.mkdir()
+    monkeypatch.setattr(api, "_CONTRACTS_ROOT", root.resolve())
+    return root
+
+
+class TestGetContract:
+    """Test suite for the /contracts/{filename} endpoints."""
+    
+    def test_missing_contract_returns_404(self, client, contracts_root):
+        """Test that an unknown contract is reported as 404 rather than a server error."""
+        response = client.get("/contracts/missing.txt", params={"folder": str(contracts_root)})
+        
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Contract not found"}
+    
+    def test_existing_contract_returns_metadata(self, client, contracts_root):
+        """Test that an existing contract returns its name and size."""
+        (contracts_root / "contract.txt").write_text("契約書", encoding="utf-8")
+        
+        response = client.get("/contracts/contract.txt", params={"folder": str(contracts_root)})
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert body["filename"] == "contract.txt"
+        assert body["size"] == len("契約書".encode("utf-8"))
+    
+    def test_raw_contract_is_served(self, client, contracts_root):
+        """Test that the text of a contract inside the contracts root is served."""
+        (contracts_root / "contract.txt").write_text("契約書", encoding="utf-8")
+        
+        response = client.get("/contracts/contract.txt/raw", params={"folder": str(contracts_root)})
+        
+        assert response.status_code == 200
+        assert response.text == "契約書"
+    
+    @pytest.mark.parametrize("endpoint", ["/contracts/secret.txt", "/contracts/secret.txt/raw"])
+    def test_folder_outside_root_returns_404(self, client, contracts_root, endpoint):
+        """Test that a folder outside the contracts root is refused, even when the file exists."""
+        (contracts_root.parent / "secret.txt").write_text("社外秘", encoding="utf-8")
+        
+        outside = client.get(endpoint, params={"folder": str(contracts_root.parent)})
+        traversal = client.get(endpoint, params={"folder": str(contracts_root / "..")})
+        
+        assert outside.status_code == 404
+        assert traversal.status_code == 404
+    
+    def test_symlink_out_of_root_returns_404(self, client, contracts_root):
+        """Test that a link inside the contracts root pointing outside it is not followed."""
+        (contracts_root.parent / "secret.txt").write_text("社外秘", encoding="utf-8")
+        (contracts_root / "link.txt").symlink_to(contracts_root.parent / "secret.txt")
+        
+        response = client.get("/contracts/link.txt/raw", params={"folder": str(contracts_root)})
+        
+        assert response.status_code == 404
+
+
+class TestListContracts:
+    """Test suite for the /contracts listing endpoint."""
+    
+    def test_missing_folder_has_same_keys_as_a_page(self, client, tmp_path):
+        """Test that a missing folder returns an empty page with the same keys as an existing one."""
+        (tmp_path / "contract.txt").write_text("契約書", encoding="utf-8")
+        params = {"offset": 0, "limit": 10}
+        
+        existing = client.get("/contracts", params={"folder": str(tmp_path), **params}).json()
+        missing = client.get("/contracts", params={"folder": str(tmp_path / "missing"), **params}).json()
+        
+        assert missing.keys() == existing.keys()
+        assert missing == {
+            "contracts": [],
+            "total": 0,
+            "folder": str(tmp_path / "missing"),
+            "offset": 0,
+            "limit": 10
+        }
+
+
+class TestContractRequest:
+    """Test suite for validating contract generation requests."""
+    
+    def contract_request(self, number_of_words):
+        """Builds a request body with the given word count."""
+        return {
+            "contract_type": "lease_agreement",
+            "number_of_words": number_of_words,
+            "party_a": "LayerX Corp",
+            "party_b": "Tenant Company",
+            "folder_to_save": "contracts"
+        }
+    
+    def test_word_count_below_form_minimum_is_rejected(self, client):
+        """Test that a word count under the form's minimum of 100 fails validation before any generation."""
+        response = client.post("/contract", json=self.contract_request(99))
+        
+        assert response.status_code == 422
+    
+    def test_word_count_at_form_minimum_is_accepted(self):
+        """Test that the form's minimum word count is a valid request."""
+        request = api.ContractRequest(**self.contract_request(100))
+        
+        assert request.number_of_words == 100
+
+
+class TestSearch:
+    """Test suite for the /search endpoints."""
+    
+    def test_search_works_across_restarts(self, tmp_path):
+        """Test that /search still works after the app has been shut down and started again."""
+        (tmp_path / "lease.txt").write_text("第1条（目的）賃貸借契約", encoding="utf-8")
+        (tmp_path / "other.txt").write_text("業務委託契約", encoding="utf-8")
+        
+        for _ in range(2):
+            with TestClient(app) as client:
+                response = client.post("/search", json={"query": "賃貸借", "folder_to_search": str(tmp_path)})
+            
+            assert response.status_code == 200
+            body = response.json()
+            assert body["total_matches"] == 1
+            assert body["results"][0]["filename"] == "lease.txt"
+            assert body["results"][0]["preview"] == "第1条（目的）賃貸借契約"
+    
+    def test_stream_matches_search(self, tmp_path):
+        """Test that the streaming search returns the same results as /search."""
+        (tmp_path / "lease.txt").write_text("賃貸借契約", encoding="utf-8")
+        (tmp_path / "other.txt").write_text("業務委託契約", encoding="utf-8")
+        
+        with TestClient(app) as client:
+            response = client.post("/search", json={"query": "契約", "folder_to_search": str(tmp_path)})
+            streamed = client.post("/search/stream", json={"query": "契約", "folder_to_search": str(tmp_path)})
+        
+        results = sorted(response.json()["results"], key=lambda result: result["filename"])
+        streamed_results = sorted(
+            (json.loads(line) for line in streamed.text.splitlines()),
+            key=lambda result: result["filename"]
+        )
+        assert streamed_results == results
+        assert [result["filename"] for result in results] == ["lease.txt", "other.txt"]
+    
+    def test_stream_returns_every_match_beyond_the_in_flight_bound(self, tmp_path, monkeypatch):
+        """Test that the stream keeps scanning new files as earlier scans finish."""
+        monkeypatch.setattr(api, "_STREAM_IN_FLIGHT", 2)
+        for i in range(7):
+            body = "賃貸借契約" if i % 2 == 0 else "業務委託契約"
+            (tmp_path / f"contract_{i}.txt").write_text(body, encoding="utf-8")
+        
+        with TestClient(app) as client:
+            streamed = client.post("/search/stream", json={"query": "賃貸借", "folder_to_search": str(tmp_path)})
+        
+        filenames = sorted(json.loads(line)["filename"] for line in streamed.text.splitlines())
+        assert filenames == ["contract_0.txt", "contract_2.txt", "contract_4.txt", "contract_6.txt"]
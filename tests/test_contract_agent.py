@@ -0,0 +1,31 @@
+import pytest
+from agents import Agent
+from src.custom_agents.contract_agent import create_contract_agent
+
+
+class TestCreateContractAgent:
+    """Test suite for contract agent construction."""
+    
+    def test_agent_includes_prompt_and_directory(self):
+        """Test that the agent instructions carry the prompt and save directory."""
+        agent = create_contract_agent("契約書を作成してください。", "my_contracts")
+        
+        assert isinstance(agent, Agent)
+        assert agent.name == "ContractAgent"
+        assert agent.instructions.startswith("契約書を作成してください。")
+        assert "my_contracts" in agent.instructions
+    
+    def test_agent_reused_for_same_prompt(self):
+        """Test that identical prompt and directory reuse the cached agent."""
+        first = create_contract_agent("Reuse prompt", "contracts")
+        second = create_contract_agent("Reuse prompt", "contracts")
+        
+        assert first is second
+    
+    def test_agent_not_shared_across_directories(self):
+        """Test that a different save directory yields a different agent."""
+        first = create_contract_agent("Shared prompt", "contracts_a")
+        second = create_contract_agent("Shared prompt", "contracts_b")
+        
+        assert first is not second
+        assert "contracts_b" in second.instructions
@@ -1,6 +1,7 @@
 import pytest
 import re
-from datetime import datetime
+from datetime import date
+from unittest.mock import patch
 from src.prompts.contract_prompt import (
     build_filename,
     build_lease_agreement_prompt,
@@ -8,6 +9,20 @@ from src.prompts.contract_prompt import (
     _sanitize_filename_part
 )
 
+# build_filename reads the date through _today; pinning it keeps the date
+# assertions deterministic even if the tests run across midnight
+FROZEN_DATE = date(2024, 1, 15)
+
+# Blank fields in the prompts are written as 20 or more underscores
+_PLACEHOLDER_RE = re.compile(r"_{20,}")
+
+
+@pytest.fixture(autouse=True, scope='module')
+def frozen_today():
+    """Freeze the date seen by build_filename for every test in this module."""
+    with patch('src.prompts.contract_prompt._today', return_value=FROZEN_DATE):
+        yield
+
 
 class TestBuildFilename:
     """Test suite for filename generation."""
@@ -21,12 +36,10 @@ class TestBuildFilename:
         assert filename.count("_") == 4  # contract, date, party_a, party_b
     
     def test_build_filename_with_date(self):
-        """Test that filename includes current date."""
+        """Test that filename includes the current (frozen) date."""
         filename = build_filename("outsourcing_contract", 1500, "Client", "Contractor")
         
-        # Extract date part
-        date_str = datetime.now().strftime("%Y%m%d")
-        assert date_str in filename
+        assert "_20240115_" in filename
     
     def test_build_filename_sanitization(self):
         """Test that party names are properly sanitized."""
@@ -54,8 +67,7 @@ class TestBuildFilename:
         assert filename.startswith("lease_agreement_")
         assert filename.endswith(".txt")
         # Should contain date
-        date_str = datetime.now().strftime("%Y%m%d")
-        assert date_str in filename
+        assert "20240115" in filename
     
     def test_build_filename_long_party_names(self):
         """Test filename with very long party names."""
@@ -150,8 +162,8 @@ class TestLeaseAgreementPrompt:
             "合意管轄（第12条）"
         ]
         
-        for section in required_sections:
-            assert section in prompt, f"Missing section: {section}"
+        missing = [section for section in required_sections if section not in prompt]
+        assert not missing, f"Missing sections: {missing}"
     
     def test_lease_agreement_word_count_bounds(self):
         """Test that word count bounds are correctly calculated."""
@@ -171,8 +183,7 @@ class TestLeaseAgreementPrompt:
         prompt = build_lease_agreement_prompt("lease_agreement", 1000, "Party A", "Party B")
         
         # Check for placeholder format
-        placeholder_pattern = r"_{20,}"  # 20 or more underscores
-        placeholders = re.findall(placeholder_pattern, prompt)
+        placeholders = _PLACEHOLDER_RE.findall(prompt)
         
         # Should have multiple placeholders
         assert len(placeholders) > 10
@@ -229,8 +240,8 @@ class TestOutsourcingContractPrompt:
             "合意管轄（第12条）"
         ]
         
-        for section in required_sections:
-            assert section in prompt, f"Missing section: {section}"
+        missing = [section for section in required_sections if section not in prompt]
+        assert not missing, f"Missing sections: {missing}"
     
     def test_outsourcing_contract_specific_placeholders(self):
         """Test outsourcing-specific placeholders."""
@@ -265,13 +276,21 @@ class TestOutsourcingContractPrompt:
             assert str(upper) in prompt
 
 
+@pytest.fixture(scope='module')
+def both_prompts():
+    """Build the lease and outsourcing prompts for the same parties once per module."""
+    return (
+        build_lease_agreement_prompt("lease_agreement", 1000, "TestA", "TestB"),
+        build_outsourcing_contract_prompt("outsourcing_contract", 1000, "TestA", "TestB"),
+    )
+
+
 class TestPromptComparison:
     """Test suite for comparing different prompt types."""
     
-    def test_prompt_type_differences(self):
+    def test_prompt_type_differences(self, both_prompts):
         """Test that different contract types generate different prompts."""
-        lease_prompt = build_lease_agreement_prompt("lease_agreement", 1000, "A", "B")
-        outsourcing_prompt = build_outsourcing_contract_prompt("outsourcing_contract", 1000, "A", "B")
+        lease_prompt, outsourcing_prompt = both_prompts
         
         # Should be different
         assert lease_prompt != outsourcing_prompt
@@ -285,10 +304,9 @@ class TestPromptComparison:
         assert "委託報酬" not in lease_prompt
         assert "知的財産権" not in lease_prompt
     
-    def test_common_elements_in_both_prompts(self):
+    def test_common_elements_in_both_prompts(self, both_prompts):
         """Test that both prompt types share common elements."""
-        lease_prompt = build_lease_agreement_prompt("lease_agreement", 1000, "TestA", "TestB")
-        outsourcing_prompt = build_outsourcing_contract_prompt("outsourcing_contract", 1000, "TestA", "TestB")
+        lease_prompt, outsourcing_prompt = both_prompts
         
         # Common elements
         common_elements = [
@@ -356,4 +374,35 @@ class TestPromptEdgeCases:
         # Should still work and include the names
         assert long_name_a in long_prompt
         assert long_name_b in long_prompt
-        assert "賃貸借契約書" in long_prompt
\ No newline at end of file
+        assert "賃貸借契約書" in long_prompt
+
+class TestPromptCaching:
+    """Test suite for memoized prompt and filename generation."""
+    
+    def test_repeated_prompt_is_served_from_cache(self):
+        """Test that identical prompt requests reuse the cached string."""
+        first = build_lease_agreement_prompt("lease_agreement", 1000, "CacheA", "CacheB")
+        second = build_lease_agreement_prompt("lease_agreement", 1000, "CacheA", "CacheB")
+        
+        assert first is second
+        assert build_lease_agreement_prompt.cache_info().hits >= 1
+    
+    def test_filename_cache_keyed_on_date(self):
+        """Test that cached filenames still change when the date changes."""
+        from src.prompts.contract_prompt import _build_filename_for_date
+        
+        day_one = _build_filename_for_date("lease_agreement", date(2024, 12, 1), "A", "B")
+        day_two = _build_filename_for_date("lease_agreement", date(2024, 12, 2), "A", "B")
+        
+        assert day_one == "lease_agreement_20241201_A_B.txt"
+        assert day_two == "lease_agreement_20241202_A_B.txt"
+    
+    def test_request_values_come_after_shared_prefix(self):
+        """Test that prompts for different requests share everything up to the party block."""
+        first = build_outsourcing_contract_prompt("outsourcing_contract", 1000, "PrefixA", "PrefixB")
+        second = build_outsourcing_contract_prompt("outsourcing_contract", 3000, "OtherA", "OtherB")
+        
+        prefix = first[:first.index("**【契約当事者と語数】**")]
+        assert second.startswith(prefix)
+        assert "PrefixA" not in prefix
+        assert "1000" not in prefix
@@ -0,0 +1,106 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from src.custom_agents import contract_review_agent
+from src.custom_agents.contract_review_agent import ContractReviewAgent
+
+
+class TestContractReviewCache:
+    """Test suite for the contract review response cache."""
+
+    def setup_method(self):
+        """Setup method run before each test."""
+        contract_review_agent._review_cache.clear()
+        contract_review_agent._review_run_config.cache_clear()
+
+    def teardown_method(self):
+        """Cleanup after each test."""
+        contract_review_agent._review_cache.clear()
+        contract_review_agent._review_run_config.cache_clear()
+
+    @pytest.mark.asyncio
+    @patch('src.custom_agents.contract_review_agent.get_model_provider')
+    @patch('src.custom_agents.contract_review_agent.Runner.run')
+    async def test_repeat_review_served_from_cache(self, mock_runner_run, mock_get_provider, tmp_path):
+        """Test that reviewing an unchanged file twice calls the model once."""
+        contract_file = tmp_path / "contract.txt"
+        contract_file.write_text("賃貸借契約書", encoding="utf-8")
+        mock_runner_run.return_value = MagicMock(final_output="レビュー結果")
+
+        agent = ContractReviewAgent()
+        first = await agent.review_contract(str(contract_file))
+        second = await agent.review_contract(str(contract_file))
+
+        assert first == second == "レビュー結果"
+        assert mock_runner_run.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch('src.custom_agents.contract_review_agent.get_model_provider')
+    @patch('src.custom_agents.contract_review_agent.Runner.run')
+    async def test_changed_file_or_review_type_misses_cache(self, mock_runner_run, mock_get_provider, tmp_path):
+        """Test that edited content or another review type triggers a new review."""
+        contract_file = tmp_path / "contract.txt"
+        contract_file.write_text("第1条", encoding="utf-8")
+        mock_runner_run.return_value = MagicMock(final_output="レビュー結果")
+
+        agent = ContractReviewAgent()
+        await agent.review_contract(str(contract_file))
+        await agent.review_contract(str(contract_file), review_type="summary")
+        contract_file.write_text("第1条 第2条", encoding="utf-8")
+        await agent.review_contract(str(contract_file))
+
+        assert mock_runner_run.call_count == 3
+
+    @pytest.mark.asyncio
+    @patch('src.custom_agents.contract_review_agent.get_model_provider')
+    @patch('src.custom_agents.contract_review_agent.Runner.run')
+    async def test_errors_are_not_cached(self, mock_runner_run, mock_get_provider, tmp_path):
+        """Test that a failed review is retried on the next call."""
+        contract_file = tmp_path / "contract.txt"
+        contract_file.write_text("第1条", encoding="utf-8")
+        mock_runner_run.side_effect = [Exception("API down"), MagicMock(final_output="レビュー結果")]
+
+        agent = ContractReviewAgent()
+        first = await agent.review_contract(str(contract_file))
+        second = await agent.review_contract(str(contract_file))
+
+        assert first.startswith("Error during contract review")
+        assert second == "レビュー結果"
+
+    @pytest.mark.asyncio
+    @patch('src.custom_agents.contract_review_agent.get_model_provider')
+    @patch('src.custom_agents.contract_review_agent.Runner.run')
+    async def test_review_contracts_keeps_input_order(self, mock_runner_run, mock_get_provider, tmp_path):
+        """Test that reviewing several files returns one result per path, in order."""
+        paths = []
+        for name in ("a.txt", "b.txt", "c.txt"):
+            contract_file = tmp_path / name
+            contract_file.write_text(name, encoding="utf-8")
+            paths.append(str(contract_file))
+
+        async def review(agent, input, run_config):
+            return MagicMock(final_output=next(p for p in paths if p in input))
+        mock_runner_run.side_effect = review
+
+        results = await ContractReviewAgent().review_contracts(paths, review_type="summary")
+
+        assert results == paths
+
+
+class TestSharedReviewAgent:
+    """Test suite for the shared review agent and run configuration."""
+
+    def test_review_agent_is_shared(self):
+        """Test that get_review_agent hands out a single instance."""
+        from src.custom_agents.contract_review_agent import get_review_agent
+
+        assert get_review_agent() is get_review_agent()
+
+    @patch('src.custom_agents.contract_review_agent.get_model_provider')
+    def test_run_config_is_built_once(self, mock_get_provider):
+        """Test that the review run configuration is reused across calls."""
+        contract_review_agent._review_run_config.cache_clear()
+        try:
+            assert contract_review_agent._review_run_config() is contract_review_agent._review_run_config()
+            mock_get_provider.assert_called_once()
+        finally:
+            contract_review_agent._review_run_config.cache_clear()
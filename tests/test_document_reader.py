@@ -0,0 +1,50 @@
+import pytest
+import os
+from src.tools.document_reader import _read_text
+
+
+class TestReadTextCache:
+    """Test suite for the cached contract file reader."""
+    
+    def setup_method(self):
+        """Setup method run before each test."""
+        _read_text.cache_clear()
+    
+    def teardown_method(self):
+        """Cleanup after each test."""
+        _read_text.cache_clear()
+    
+    def test_unchanged_file_is_read_once(self, tmp_path):
+        """Test that repeated reads of an unchanged file are served from the cache."""
+        contract_file = tmp_path / "contract.txt"
+        contract_file.write_text("賃貸借契約書", encoding="utf-8")
+        stat = os.stat(contract_file)
+        
+        first = _read_text(str(contract_file), stat.st_mtime_ns, stat.st_size)
+        second = _read_text(str(contract_file), stat.st_mtime_ns, stat.st_size)
+        
+        assert first == second == "賃貸借契約書"
+        assert _read_text.cache_info().hits == 1
+    
+    def test_edited_file_is_read_again(self, tmp_path):
+        """Test that a changed mtime or size invalidates the cached content."""
+        contract_file = tmp_path / "contract.txt"
+        contract_file.write_text("第1条", encoding="utf-8")
+        stat = os.stat(contract_file)
+        _read_text(str(contract_file), stat.st_mtime_ns, stat.st_size)
+        
+        contract_file.write_text("第1条 第2条", encoding="utf-8")
+        os.utime(contract_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        stat = os.stat(contract_file)
+        
+        assert _read_text(str(contract_file), stat.st_mtime_ns, stat.st_size) == "第1条 第2条"
+    
+    def test_invalid_utf8_is_not_cached(self, tmp_path):
+        """Test that a decode failure raises and leaves nothing in the cache."""
+        contract_file = tmp_path / "binary.txt"
+        contract_file.write_bytes(b"\xff\xfe\x00")
+        stat = os.stat(contract_file)
+        
+        with pytest.raises(UnicodeDecodeError):
+            _read_text(str(contract_file), stat.st_mtime_ns, stat.st_size)
+        assert _read_text.cache_info().currsize == 0
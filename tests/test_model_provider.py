@@ -1,7 +1,7 @@
 import pytest
 import os
-from unittest.mock import patch, MagicMock, Mock
-from src.core.model_provider import OpenAIModelProvider
+from unittest.mock import patch, MagicMock, Mock, ANY
+from src.core.model_provider import OpenAIModelProvider, get_model_provider
 from agents import OpenAIChatCompletionsModel
 
 
@@ -29,7 +29,7 @@ class TestOpenAIModelProvider:
             provider = OpenAIModelProvider()
             
             # Verify initialization
-            mock_openai.assert_called_once_with(api_key='test-api-key')
+            mock_openai.assert_called_once_with(api_key='test-api-key', http_client=ANY)
             assert provider.model_name == 'gpt-4-turbo'
             assert provider.temperature == 0.5
     
@@ -39,7 +39,7 @@ class TestOpenAIModelProvider:
         provider = OpenAIModelProvider()
         
         # Verify defaults are used
-        mock_openai.assert_called_once_with(api_key=None)  # os.getenv returns None
+        mock_openai.assert_called_once_with(api_key=None, http_client=ANY)  # os.getenv returns None
         assert provider.model_name == 'gpt-4o'  # Default value
         assert provider.temperature == 0.2  # Default value
     
@@ -95,7 +95,7 @@ class TestOpenAIModelProvider:
             provider = OpenAIModelProvider()
             
             assert provider.client == mock_client
-            mock_openai.assert_called_once_with(api_key='test-key')
+            mock_openai.assert_called_once_with(api_key='test-key', http_client=ANY)
     
     @patch('src.core.model_provider.openai.AsyncOpenAI')
     def test_temperature_conversion(self, mock_openai):
@@ -252,4 +252,17 @@ class TestOpenAIModelProviderPerformance:
             assert isinstance(model, OpenAIChatCompletionsModel)
         
         # Client should only be created once
-        assert mock_openai.call_count == 1 
\ No newline at end of file
+        assert mock_openai.call_count == 1
+    
+    @patch('src.core.model_provider.openai.AsyncOpenAI')
+    def test_shared_provider_is_created_once(self, mock_openai):
+        """Test that get_model_provider hands out a single shared provider."""
+        get_model_provider.cache_clear()
+        try:
+            first = get_model_provider()
+            second = get_model_provider()
+            
+            assert first is second
+            mock_openai.assert_called_once()
+        finally:
+            get_model_provider.cache_clear()
@@ -14,6 +14,7 @@ class TestRunContractBasic:
         """Test run_contract with mocked dependencies (original test)."""
         # Fake result to simulate what LLM would return
         class FakeResult:
+            new_items = []
             final_output = '{"message": "保存が成功しました。"}'
 
         # Replace Runner.run with the fake async function
@@ -43,6 +44,7 @@ class TestRunContractBasic:
         
         # Create a more realistic fake result
         class FakeResult:
+            new_items = []
             final_output = json.dumps({
                 "message": "Contract saved successfully as lease_agreement_20241201_LayerX_Tenant.txt",
                 "filename": "lease_agreement_20241201_LayerX_Tenant.txt",
@@ -81,6 +83,7 @@ class TestRunContractBasic:
         mock_get_client.return_value = mock_langfuse
         
         class FakeResult:
+            new_items = []
             final_output = json.dumps({
                 "message": "業務委託契約書を正常に保存しました",
                 "document_content": "業務委託契約書の内容..."
@@ -115,6 +118,7 @@ class TestRunContractTokenCalculation:
         captured_configs = []
         
         class FakeResult:
+            new_items = []
             final_output = '{"message": "Success"}'
 
         async def fake_run(agent, input, run_config):
@@ -158,6 +162,7 @@ class TestRunContractTokenCalculation:
         captured_config = None
         
         class FakeResult:
+            new_items = []
             final_output = '{"message": "Success"}'
 
         async def fake_run(agent, input, run_config):
@@ -193,6 +198,7 @@ class TestRunContractErrorHandling:
         mock_get_client.return_value = mock_langfuse
         
         class FakeResult:
+            new_items = []
             final_output = "This is not valid JSON"
 
         async def fake_run(agent, input, run_config):
@@ -252,6 +258,7 @@ class TestRunContractErrorHandling:
         mock_get_client.return_value = mock_langfuse
         
         class FakeResult:
+            new_items = []
             final_output = json.dumps({
                 "filename": "test.txt",
                 "path": "/contracts/test.txt"
@@ -285,6 +292,7 @@ class TestRunContractEdgeCases:
         mock_get_client.return_value = mock_langfuse
         
         class FakeResult:
+            new_items = []
             final_output = json.dumps({
                 "message": "日本語の契約書を保存しました",
                 "document_content": "契約書の内容（日本語）"
@@ -318,6 +326,7 @@ class TestRunContractEdgeCases:
         mock_get_client.return_value = mock_langfuse
         
         class FakeResult:
+            new_items = []
             final_output = '{"message": "Contract saved with special chars"}'
 
         async def fake_run(agent, input, run_config):
@@ -343,6 +352,7 @@ class TestRunContractEdgeCases:
         mock_get_client.return_value = mock_langfuse
         
         class FakeResult:
+            new_items = []
             final_output = '{"message": "Minimum contract saved"}'
 
         async def fake_run(agent, input, run_config):
@@ -370,6 +380,7 @@ class TestRunContractEdgeCases:
         mock_get_client.return_value = mock_langfuse
         
         class FakeResult:
+            new_items = []
             final_output = '{"message": "Large contract saved"}'
 
         async def fake_run(agent, input, run_config):
@@ -402,6 +413,7 @@ class TestRunContractIntegration:
         
         # Only mock the final Runner.run call
         class FakeResult:
+            new_items = []
             final_output = json.dumps({
                 "message": "Contract generated and saved successfully",
                 "filename": "lease_agreement_20241201_TestCorp_TestTenant.txt",
@@ -457,6 +469,7 @@ class TestRunContractIntegration:
         captured_input = None
         
         class FakeResult:
+            new_items = []
             final_output = '{"message": "Integration test passed"}'
 
         async def fake_run(agent, input, run_config):
@@ -4,11 +4,11 @@ import json
 import tempfile
 import shutil
 from unittest.mock import patch, MagicMock
-from src.tools.save_tool import save_str_to_disc, get_unique_filename
+from src.tools.save_tool import save_str_to_disc, save_document, copy_document
 
 
-class TestGetUniqueFilename:
-    """Test suite for unique filename generation."""
+class TestSaveDocumentNaming:
+    """Test suite for how save_document names the files it creates."""
     
     def setup_method(self):
         """Setup method to create a temporary directory for testing."""
@@ -19,86 +19,145 @@ class TestGetUniqueFilename:
         if os.path.exists(self.test_dir):
             shutil.rmtree(self.test_dir)
     
+    def saved_name(self, filename, directory=None):
+        """Saves a small document and returns the name it was saved under."""
+        return json.loads(save_document("content", filename, directory or self.test_dir))["filename"]
+    
     def test_unique_filename_no_collision(self):
         """Test filename generation when no collision exists."""
-        result = get_unique_filename("test_file", ".txt", self.test_dir)
-        expected = os.path.join(self.test_dir, "test_file.txt")
-        assert result == expected
-        assert not os.path.exists(result)  # File should not exist yet
+        assert self.saved_name("test_file.txt") == "test_file.txt"
     
     def test_unique_filename_with_collision(self):
         """Test filename generation when collision exists."""
         # Create a file that will cause collision
-        original_path = os.path.join(self.test_dir, "test_file.txt")
-        with open(original_path, 'w') as f:
+        with open(os.path.join(self.test_dir, "test_file.txt"), 'w') as f:
             f.write("existing content")
         
-        result = get_unique_filename("test_file", ".txt", self.test_dir)
-        expected = os.path.join(self.test_dir, "test_file_001.txt")
-        assert result == expected
-        assert not os.path.exists(result)  # New file should not exist yet
+        assert self.saved_name("test_file.txt") == "test_file_001.txt"
     
     def test_unique_filename_multiple_collisions(self):
         """Test filename generation with multiple collisions."""
         # Create multiple files that will cause collisions
-        files_to_create = [
-            "test_file.txt",
-            "test_file_001.txt",
-            "test_file_002.txt"
-        ]
-        
-        for filename in files_to_create:
-            path = os.path.join(self.test_dir, filename)
-            with open(path, 'w') as f:
+        for filename in ["test_file.txt", "test_file_001.txt", "test_file_002.txt"]:
+            with open(os.path.join(self.test_dir, filename), 'w') as f:
                 f.write("existing content")
         
-        result = get_unique_filename("test_file", ".txt", self.test_dir)
-        expected = os.path.join(self.test_dir, "test_file_003.txt")
-        assert result == expected
+        assert self.saved_name("test_file.txt") == "test_file_003.txt"
     
     def test_unique_filename_no_extension(self):
         """Test filename generation with no extension."""
-        result = get_unique_filename("test_file", "", self.test_dir)
-        expected = os.path.join(self.test_dir, "test_file.txt")  # Default extension
-        assert result == expected
-    
-    def test_unique_filename_none_extension(self):
-        """Test filename generation with None extension."""
-        result = get_unique_filename("test_file", "", self.test_dir)  # Use empty string instead of None
-        expected = os.path.join(self.test_dir, "test_file.txt")  # Default extension
-        assert result == expected
+        assert self.saved_name("test_file") == "test_file.txt"  # Default extension
     
     def test_unique_filename_strips_dots(self):
         """Test that trailing dots are stripped from base name."""
-        result = get_unique_filename("test_file....", ".txt", self.test_dir)
-        expected = os.path.join(self.test_dir, "test_file.txt")
-        assert result == expected
+        assert self.saved_name("test_file....txt") == "test_file.txt"
     
     def test_unique_filename_creates_directory(self):
         """Test that directory is created if it doesn't exist."""
         new_dir = os.path.join(self.test_dir, "new_subdir")
         assert not os.path.exists(new_dir)
         
-        result = get_unique_filename("test_file", ".txt", new_dir)
-        assert os.path.exists(new_dir)
+        self.saved_name("test_file.txt", new_dir)
         assert os.path.isdir(new_dir)
     
-    def test_unique_filename_counter_format(self):
-        """Test that counter uses proper 3-digit format."""
-        # Create files to test counter format
-        original_path = os.path.join(self.test_dir, "test.txt")
-        with open(original_path, 'w') as f:
-            f.write("content")
-        
-        result = get_unique_filename("test", ".txt", self.test_dir)
-        expected = os.path.join(self.test_dir, "test_001.txt")
-        assert result == expected
-    
     def test_unique_filename_japanese_characters(self):
         """Test filename generation with Japanese characters."""
-        result = get_unique_filename("契約書_テスト", ".txt", self.test_dir)
-        expected = os.path.join(self.test_dir, "契約書_テスト.txt")
-        assert result == expected
+        assert self.saved_name("契約書_テスト.txt") == "契約書_テスト.txt"
+
+
+class TestSaveDocument:
+    """Test suite for the plain save and copy helpers."""
+    
+    def setup_method(self):
+        """Setup method to create a temporary directory for testing."""
+        self.test_dir = tempfile.mkdtemp()
+    
+    def teardown_method(self):
+        """Cleanup method to remove temporary directory."""
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+    
+    def test_save_document_never_overwrites(self):
+        """Test that repeated saves under one name claim successive unique files."""
+        paths = [json.loads(save_document(f"契約書 {i}", "test.txt", self.test_dir))["path"] for i in range(3)]
+        
+        assert [os.path.basename(p) for p in paths] == ["test.txt", "test_001.txt", "test_002.txt"]
+        for i, path in enumerate(paths):
+            with open(path, 'r', encoding='utf-8') as f:
+                assert f.read() == f"契約書 {i}"
+    
+    def test_copy_document_missing_source_leaves_no_file(self):
+        """Test that copying a missing file fails without creating an empty copy."""
+        with pytest.raises(FileNotFoundError):
+            copy_document(os.path.join(self.test_dir, "missing.txt"), "copy.txt", self.test_dir)
+        
+        assert os.listdir(self.test_dir) == []
+    
+    def test_failed_save_leaves_no_partial_files(self):
+        """Test that a failed write removes both the claimed name and the temporary file."""
+        with pytest.raises((TypeError, AttributeError)):
+            save_document(None, "test.txt", self.test_dir)
+        
+        assert os.listdir(self.test_dir) == []
+    
+    def test_save_recreates_removed_directory(self):
+        """Test that saving still works after a cached directory was deleted."""
+        target_dir = os.path.join(self.test_dir, "contracts")
+        save_document("契約書", "test.txt", target_dir)
+        shutil.rmtree(target_dir)
+        
+        result = json.loads(save_document("契約書", "test.txt", target_dir))
+        assert os.path.exists(result["path"])
+    
+    def test_save_skips_many_existing_copies(self):
+        """Test that saving next to many existing copies picks the first free counter."""
+        for name in ["test.txt"] + [f"test_{i:03d}.txt" for i in range(1, 38)]:
+            with open(os.path.join(self.test_dir, name), 'w') as f:
+                f.write("existing content")
+        
+        first = json.loads(save_document("契約書", "test.txt", self.test_dir))
+        second = json.loads(save_document("契約書", "test.txt", self.test_dir))
+        assert first["filename"] == "test_038.txt"
+        assert second["filename"] == "test_039.txt"
+    
+    def test_save_after_cwd_change_never_overwrites(self, monkeypatch):
+        """Test that a relative save directory is resolved afresh on every save."""
+        first_root = os.path.join(self.test_dir, "first")
+        second_root = os.path.join(self.test_dir, "second")
+        os.makedirs(os.path.join(second_root, "contracts"))
+        os.makedirs(first_root)
+        for name in ("x.txt", "x_001.txt"):
+            with open(os.path.join(second_root, "contracts", name), 'w', encoding='utf-8') as f:
+                f.write("IMPORTANT EXISTING")
+        
+        monkeypatch.chdir(first_root)
+        save_document("first", "x.txt", "contracts")
+        monkeypatch.chdir(second_root)
+        result = json.loads(save_document("second", "x.txt", "contracts"))
+        
+        assert result["filename"] == "x_002.txt"
+        for name in ("x.txt", "x_001.txt"):
+            with open(os.path.join(second_root, "contracts", name), 'r', encoding='utf-8') as f:
+                assert f.read() == "IMPORTANT EXISTING"
+        assert os.listdir(os.path.join(first_root, "contracts")) == ["x.txt"]
+    
+    def test_save_without_collision_does_not_probe_names(self):
+        """Test that a free name is claimed by the O_EXCL open alone, without an existence check first."""
+        from src.tools import save_tool
+        with patch.object(save_tool, '_name_taken', wraps=save_tool._name_taken) as mock_name_taken:
+            first = json.loads(save_document("契約書", "probe.txt", self.test_dir))
+            assert mock_name_taken.call_count == 0
+            
+            other_dir = os.path.join(self.test_dir, "other")
+            os.makedirs(other_dir)
+            with open(os.path.join(other_dir, "probe.txt"), 'w') as f:
+                f.write("existing content")
+            second = json.loads(save_document("契約書", "probe.txt", other_dir))
+        
+        assert first["filename"] == "probe.txt"
+        assert second["filename"] == "probe_001.txt"
+        # Only the collision searches for a free counter
+        assert mock_name_taken.call_count > 0
 
 
 class TestSaveStrToDisc:
@@ -309,10 +368,10 @@ class TestSaveStrToDiscErrorHandling:
             save_str_to_disc(None, "test.txt", self.test_dir)
     
     @patch('src.tools.save_tool.get_client')
-    @patch('src.tools.save_tool.get_unique_filename')
-    def test_save_filename_generation_error(self, mock_get_unique_filename, mock_get_client):
+    @patch('src.tools.save_tool._create_unique_file')
+    def test_save_filename_generation_error(self, mock_create_unique_file, mock_get_client):
         """Test handling of filename generation errors."""
-        mock_get_unique_filename.side_effect = OSError("Path too long")
+        mock_create_unique_file.side_effect = OSError("Path too long")
         
         document = "Filename error test"
         filename = "test.txt"
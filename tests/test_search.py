@@ -0,0 +1,152 @@
+import pytest
+from unittest.mock import patch
+from src.search import iter_txt_file_matches, scan_and_preview, search_txt_files, search_txt_files_multi
+
+
+class TestScanAndPreview:
+    """Test suite for the per-file search worker used by the /search endpoints."""
+    
+    def test_match_returns_result_with_preview(self, tmp_path):
+        """Test that a matching file returns its metadata and the text around the match."""
+        content = "あ" * 200 + "賃貸借" + "い" * 200
+        (tmp_path / "lease.txt").write_text(content, encoding="utf-8")
+        
+        result = scan_and_preview(str(tmp_path), "lease.txt", "賃貸借", context_length=10)
+        
+        assert result["filename"] == "lease.txt"
+        assert result["size"] == len(content.encode("utf-8"))
+        assert result["preview"] == "..." + "あ" * 5 + "賃貸借" + "い" * 5 + "..."
+    
+    def test_preview_centres_on_exact_case_match(self, tmp_path):
+        """Test that the preview is cut around the exact-case match, not an earlier differently-cased one."""
+        (tmp_path / "lease.txt").write_text("lessor " + "x" * 50 + " Lessor signs", encoding="utf-8")
+        
+        result = scan_and_preview(str(tmp_path), "lease.txt", "Lessor", context_length=4)
+        
+        assert result["preview"] == "...x " + "Lessor" + " s..."
+    
+    def test_no_match_returns_none(self, tmp_path):
+        """Test that a file without the string is not a result."""
+        (tmp_path / "other.txt").write_text("業務委託契約", encoding="utf-8")
+        
+        assert scan_and_preview(str(tmp_path), "other.txt", "賃貸借") is None
+    
+    def test_removed_file_returns_none(self, tmp_path):
+        """Test that a file removed after listing is skipped."""
+        assert scan_and_preview(str(tmp_path), "missing.txt", "賃貸借") is None
+    
+    def test_symlink_outside_folder_returns_none(self, tmp_path):
+        """Test that a file resolving outside the searched folder is never read."""
+        outside = tmp_path / "outside.txt"
+        outside.write_text("賃貸借", encoding="utf-8")
+        folder = tmp_path / "contracts"
+        folder.mkdir()
+        (folder / "link.txt").symlink_to(outside)
+        
+        assert scan_and_preview(str(folder), "link.txt", "賃貸借") is None
+
+
+class TestSearchTxtFiles:
+    """Test suite for the threaded search_txt_files."""
+    
+    @pytest.fixture
+    def folder(self, tmp_path):
+        """A folder of contracts, every third of which contains the search string."""
+        for i in range(30):
+            body = "第1条（目的）賃貸借契約" if i % 3 == 0 else "業務委託契約"
+            (tmp_path / f"contract_{i:02d}.txt").write_text(body, encoding="utf-8")
+        (tmp_path / "notes.md").write_text("賃貸借", encoding="utf-8")
+        (tmp_path / "賃貸借_draft.txt").write_text("", encoding="utf-8")
+        return tmp_path
+    
+    def test_matches_sequential_search_in_order(self, folder):
+        """Test that the threaded search returns the same names, in the same order, as the sequential one."""
+        results = search_txt_files(str(folder), "賃貸借")
+        
+        assert results == list(iter_txt_file_matches(str(folder), "賃貸借"))
+        assert sorted(results) == [f"contract_{i:02d}.txt" for i in range(0, 30, 3)]
+    
+    def test_matches_sequential_search_with_filename_fast_path(self, folder):
+        """Test that both searches agree when filename matches are counted too."""
+        results = search_txt_files(str(folder), "賃貸借", filename_fast_path=True)
+        
+        assert results == list(iter_txt_file_matches(str(folder), "賃貸借", filename_fast_path=True))
+        assert "賃貸借_draft.txt" in results
+        assert "notes.md" not in results
+
+
+class TestEntryPrefilters:
+    """Test suite for the checks that decide a match without scanning the file."""
+    
+    def test_filename_hit_matches_empty_file(self, tmp_path):
+        """Test that with the fast path a file named after the string matches even though it is empty."""
+        (tmp_path / "賃貸借_draft.txt").write_text("", encoding="utf-8")
+        
+        assert list(iter_txt_file_matches(str(tmp_path), "賃貸借", filename_fast_path=True)) == ["賃貸借_draft.txt"]
+        assert list(iter_txt_file_matches(str(tmp_path), "賃貸借")) == []
+    
+    @patch('src.search.file_contains')
+    def test_file_shorter_than_encoded_needle_is_not_opened(self, mock_file_contains, tmp_path):
+        """Test that a file with fewer bytes than the UTF-8 needle is skipped without being scanned."""
+        # Six bytes: longer than the needle's three characters, shorter than its nine encoded bytes
+        (tmp_path / "short.txt").write_text("abcdef", encoding="utf-8")
+        
+        assert list(iter_txt_file_matches(str(tmp_path), "賃貸借")) == []
+        mock_file_contains.assert_not_called()
+    
+    @patch('src.search.file_contains', return_value=False)
+    def test_file_as_long_as_encoded_needle_is_scanned(self, mock_file_contains, tmp_path):
+        """Test that a file at least as long as the encoded needle is still scanned."""
+        (tmp_path / "long.txt").write_text("abcdefghi", encoding="utf-8")
+        
+        assert list(iter_txt_file_matches(str(tmp_path), "賃貸借")) == []
+        mock_file_contains.assert_called_once()
+
+
+class TestSearchTxtFilesMulti:
+    """Test suite for searching several strings in one pass over the files."""
+    
+    def test_empty_file_matches_only_empty_string(self, tmp_path):
+        """Test that an empty file, which cannot be memory-mapped, matches only the empty string."""
+        (tmp_path / "empty.txt").write_bytes(b"")
+        
+        assert search_txt_files_multi(str(tmp_path), ["", "賃貸借"]) == {"": ["empty.txt"], "賃貸借": []}
+    
+    def test_needle_longer_than_file_does_not_match(self, tmp_path):
+        """Test that a string longer than the file is not found, while a shorter one still is."""
+        (tmp_path / "short.txt").write_text("契約", encoding="utf-8")
+        
+        results = search_txt_files_multi(str(tmp_path), ["契約", "賃貸借契約書"])
+        
+        assert results == {"契約": ["short.txt"], "賃貸借契約書": []}
+    
+    def test_overlapping_strings_all_match(self, tmp_path):
+        """Test that strings sharing bytes in the same place of a file are each reported."""
+        (tmp_path / "lease.txt").write_text("賃貸借契約", encoding="utf-8")
+        (tmp_path / "other.txt").write_text("業務委託契約", encoding="utf-8")
+        
+        results = search_txt_files_multi(str(tmp_path), ["賃貸", "貸借", "賃貸借", "契約"])
+        
+        assert results["賃貸"] == ["lease.txt"]
+        assert results["貸借"] == ["lease.txt"]
+        assert results["賃貸借"] == ["lease.txt"]
+        assert sorted(results["契約"]) == ["lease.txt", "other.txt"]
+    
+    def test_non_utf8_file_is_matched_on_utf8_bytes(self, tmp_path):
+        """Test that a Shift_JIS file is scanned without errors and only matches the UTF-8 bytes it holds."""
+        (tmp_path / "sjis.txt").write_bytes("賃貸借 Lease".encode("shift_jis"))
+        
+        results = search_txt_files_multi(str(tmp_path), ["賃貸借", "Lease"])
+        
+        assert results == {"賃貸借": [], "Lease": ["sjis.txt"]}
+    
+    def test_matches_single_string_search(self, tmp_path):
+        """Test that each string's results equal a separate search_txt_files call."""
+        for i in range(10):
+            body = "賃貸借契約" if i % 2 else "業務委託契約"
+            (tmp_path / f"contract_{i}.txt").write_text(body, encoding="utf-8")
+        
+        results = search_txt_files_multi(str(tmp_path), ["賃貸借", "業務委託", "契約"])
+        
+        for search_string, names in results.items():
+            assert names == search_txt_files(str(tmp_path), search_string)